@@ -0,0 +1,187 @@
+import numpy as np
+
+from typing import List
+
+# package imports
+from game import Game, Board, Piece, PATTERN_TABLE
+
+
+class GameBatch:
+    """ Many games stepped in lockstep with vectorized operations
+
+        The boards are stacked into an (N, 144) array of cell owners laid out as in
+        Board.toArray (diarcs 0-89, then triarcs 90-143), with the players' remaining pieces,
+        scores and turns kept alongside. Moves are given as cell indices.
+    """
+    # no move for a game (e.g. one that is over)
+    NO_MOVE = -1
+
+    def __init__( self, numGames: int ):
+        """ GameBatch constructor
+
+            :param numGames: the number of new games in the batch
+
+        """
+        self.cells = np.zeros( (numGames, Board.NUM_PIECES), dtype=np.int8 )
+
+        # [game, player number, piece type value] remaining pieces (player index 0 is unused)
+        self.pieces = np.zeros( (numGames, 3, 2), dtype=np.int16 )
+        self.pieces[ :, 1:, Piece.DIARC.value ] = Game.START_DIARCS
+        self.pieces[ :, 1:, Piece.TRIARC.value ] = Game.START_TRIARCS
+
+        # [game, player number] scores (player index 0 is unused)
+        self.scores = np.zeros( (numGames, 3), dtype=np.int32 )
+        self.turn = np.ones( numGames, dtype=np.int8 )
+
+        self._games = np.arange( numGames )
+
+    # __init__
+
+    def __len__( self ):
+        return self.cells.shape[ 0 ]
+
+    # __len__
+
+    @classmethod
+    def fromGames( cls, games: List[ Game ] ):
+        """ Build a batch from the current states of games
+
+            :param games: list of the Games to stack
+
+            :returns: GameBatch of the games' states
+        """
+        batch = cls( len( games ) )
+        for i, game in enumerate( games ):
+            batch.cells[ i ] = game.board.toArray()
+            for player in (game.player1, game.player2):
+                batch.pieces[ i, player.number, Piece.DIARC.value ] = player.diarcs
+                batch.pieces[ i, player.number, Piece.TRIARC.value ] = player.triarcs
+
+            # for
+            batch.scores[ i, 1 ] = game.player1Score
+            batch.scores[ i, 2 ] = game.player2Score
+            batch.turn[ i ] = game.turn
+
+        # for
+
+        return batch
+
+    # fromGames
+
+    def isFilled( self ):
+        """ Check which of the boards are filled
+
+            :returns: (N,) boolean array
+        """
+        return ~(self.cells == 0).any( axis=1 )
+
+    # isFilled
+
+    def legalMoves( self ):
+        """ Get the valid moves of the player to move in each game
+
+            :returns: (N, 144) boolean array of the valid cells
+        """
+        legal = self.cells == 0
+        pieces = self.pieces[ self._games, self.turn ]
+        legal[ :, :Board.NUM_DIARCS ] &= (pieces[ :, Piece.DIARC.value ] > 0)[ :, None ]
+        legal[ :, Board.NUM_DIARCS: ] &= (pieces[ :, Piece.TRIARC.value ] > 0)[ :, None ]
+
+        return legal
+
+    # legalMoves
+
+    def scoreMoves( self, legal: np.ndarray = None ):
+        """ Score every placement of the player to move in each game
+
+            Equivalent to Game.scoreAllMoves on each of the games.
+
+            :param legal: (Optional) the legalMoves of the batch, if already computed
+
+            :returns: (N, 144) array of the cells' score updates, 0 for invalid moves
+        """
+        if legal is None:
+            legal = self.legalMoves()
+
+        # if
+
+        owned = (self.cells == self.turn[ :, None ]).astype( np.float32 ) @ PATTERN_TABLE.incidenceT
+        completable = np.where( owned == PATTERN_TABLE.sizes - 1, PATTERN_TABLE.points, 0 )
+        scores = (completable.astype( np.float32 ) @ PATTERN_TABLE.incidence).astype( np.int32 )
+
+        return np.where( legal, scores, 0 )
+
+    # scoreMoves
+
+    def step( self, moves: np.ndarray ):
+        """ Play a move in each of the games
+
+            :param moves: (N,) array of the cells to play, NO_MOVE to skip a game
+
+            :returns: (N,) array of the score updates of the moves
+        """
+        moves = np.asarray( moves )
+        legal = self.legalMoves()
+        playing = moves != self.NO_MOVE
+        games = self._games[ playing ]
+        cells = moves[ playing ]
+        if not legal[ games, cells ].all():
+            raise ValueError( "Invalid moves given to step!" )
+
+        # if
+
+        updates = np.zeros( len( self ), dtype=np.int32 )
+        updates[ games ] = self.scoreMoves( legal )[ games, cells ]
+
+        turn = self.turn[ games ]
+        self.cells[ games, cells ] = turn
+        self.pieces[ games, turn, (cells >= Board.NUM_DIARCS).astype( np.int8 ) ] -= 1
+        self.scores[ games, turn ] += updates[ games ]
+        self.turn[ games ] = 3 - turn
+
+        return updates
+
+    # step
+
+    def randomMoves( self, rng: np.random.Generator, legal: np.ndarray = None ):
+        """ Pick a uniformly random valid move in each game
+
+            :param rng: the numpy random Generator to draw from
+            :param legal: (Optional) the legalMoves of the batch, if already computed
+
+            :returns: (N,) array of the chosen cells, NO_MOVE for games with no valid moves
+        """
+        if legal is None:
+            legal = self.legalMoves()
+
+        # if
+
+        keys = np.where( legal, rng.random( legal.shape ), -1.0 )
+        moves = keys.argmax( axis=1 )
+
+        return np.where( legal.any( axis=1 ), moves, self.NO_MOVE )
+
+    # randomMoves
+
+    def greedyMoves( self, rng: np.random.Generator, legal: np.ndarray = None ):
+        """ Pick the highest scoring valid move in each game, breaking ties randomly
+
+            :param rng: the numpy random Generator to draw from
+            :param legal: (Optional) the legalMoves of the batch, if already computed
+
+            :returns: (N,) array of the chosen cells, NO_MOVE for games with no valid moves
+        """
+        if legal is None:
+            legal = self.legalMoves()
+
+        # if
+
+        keys = np.where( legal, self.scoreMoves( legal ) + rng.random( legal.shape ), -1.0 )
+        moves = keys.argmax( axis=1 )
+
+        return np.where( legal.any( axis=1 ), moves, self.NO_MOVE )
+
+    # greedyMoves
+
+
+# class: GameBatch
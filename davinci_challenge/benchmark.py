@@ -0,0 +1,396 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+import numpy as np
+
+# package imports
+from game import Game, Board, Piece, Pattern
+from bitboard import BitBoard
+from mcts import MonteCarloTreeSearch
+
+# board backends that can be benchmarked
+BOARDS = {
+    "board"   : Board,
+    "bitboard": BitBoard,
+}
+
+# stage -> number of random moves made to reach it
+STAGES = {
+    "opening" : 10,
+    "midgame" : Board.NUM_PIECES // 2,
+    "nearfull": Board.NUM_PIECES - 8,
+}
+
+
+def _allMoves( game: Game ):
+    """ Every placement of the player on deck, valid or not """
+    return [
+        Board.Move( location, piece, game.playerOnDeck )
+        for piece, location in map( Board.getPieceLocation, range( Board.NUM_PIECES ) )
+    ]
+
+# _allMoves
+
+
+def randomPosition( moves: int, seed: int, board: Board = None ):
+    """ Reach a reproducible position by making random valid moves
+
+        :param moves: the number of moves to make
+        :param seed: the seed of the moves
+        :param board: (Optional) an empty board backend to play on (default is a new Board)
+
+        :returns: the Game at the position
+    """
+    rng = random.Random( seed )
+    game = Game( board )
+    for _ in range( moves ):
+        game.make( rng.choice( list( game.legalMoves() ) ) )
+
+    # for
+
+    return game
+
+# randomPosition
+
+
+def timeCalls( func: Callable[ [ ], int ], repeat: int = 5, minTime: float = 0.05 ):
+    """ Time a benchmark function, taking the best of several runs
+
+        :param func: function running the benchmarked operation some number of times and
+                     returning that number
+        :param repeat: the number of runs to take the best of
+        :param minTime: the minimum time of a run in seconds, reached by calling func repeatedly
+
+        :returns: (best seconds per operation, total number of operations timed), with None
+                  seconds if func has nothing to run (e.g. no valid moves at the position)
+    """
+    best = float( "inf" )
+    total_calls = 0
+    for _ in range( repeat ):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            num_calls = func()
+            if num_calls == 0:
+                return None, 0
+
+            # if
+            calls += num_calls
+            elapsed = time.perf_counter() - start
+            if elapsed >= minTime:
+                break
+
+            # if
+        # while
+
+        best = min( best, elapsed / max( 1, calls ) )
+        total_calls += calls
+
+    # for
+
+    return best, total_calls
+
+# timeCalls
+
+
+def benchmarkPosition( game: Game, repeat: int = 5, playouts: int = 10, seed: int = 0 ):
+    """ Benchmark the board and scoring operations at a position
+
+        :param game: the Game at the position to benchmark
+        :param repeat: the number of timing runs to take the best of
+        :param playouts: the number of random playouts per timing call
+        :param seed: the seed of the random playouts
+
+        :returns: dict of benchmark name -> dict of its timing
+    """
+    board = game.board
+    moves = _allMoves( game )
+    valid_moves = [ move for move in moves if board.isValidMove( move ) ]
+    row_columns = [ (move.piece, *Board.getRowColumn( move.piece, move.location )) for move in moves ]
+
+    def isValidMove():
+        for move in moves:
+            board.isValidMove( move )
+
+        # for
+
+        return len( moves )
+
+    # isValidMove
+
+    def playPiece():
+        for move in valid_moves:
+            board.playPiece( move )
+            board.undoPiece( move )
+
+        # for
+
+        return len( valid_moves )
+
+    # playPiece
+
+    def legalMoves():
+        return sum( 1 for _ in board.legalMoves( game.playerOnDeck ) )
+
+    # legalMoves
+
+    def clone():
+        game.clone()
+
+        return 1
+
+    # clone
+
+    def getRowColumn():
+        for move in moves:
+            Board.getRowColumn( move.piece, move.location )
+
+        # for
+
+        return len( moves )
+
+    # getRowColumn
+
+    def rowColumnToIndex():
+        for piece, row, col in row_columns:
+            Board.rowColumnToIndex( piece, row, col )
+
+        # for
+
+        return len( row_columns )
+
+    # rowColumnToIndex
+
+    def checkScore( method: Callable[ [ Board.Move ], int ], piece: Piece ):
+        piece_moves = [ move for move in valid_moves if move.piece is piece ]
+
+        def run():
+            for move in piece_moves:
+                method( move )
+
+            # for
+
+            return len( piece_moves )
+
+        # run
+
+        return run
+
+    # checkScore
+
+    rng = random.Random( seed )
+
+    def gamePlayouts():
+        """ Random playouts through Game.legalCodes and make/unmake, as the search engines play """
+        for _ in range( playouts ):
+            plies = 0
+            moves = tuple( game.legalCodes() )
+            while moves:
+                game.make( rng.choice( moves ) )
+                plies += 1
+                moves = tuple( game.legalCodes() )
+
+            # while
+
+            for _ in range( plies ):
+                game.unmake()
+
+            # for
+        # for
+
+        return playouts
+
+    # gamePlayouts
+
+    mcts = MonteCarloTreeSearch( seed=seed )
+    cells, diarcs, triarcs, _ = MonteCarloTreeSearch._unpackSnapshot( MonteCarloTreeSearch.getSnapshot( game ) )
+
+    def mctsPlayouts():
+        """ Random playouts of the position as MonteCarloTreeSearch runs them """
+        for _ in range( playouts ):
+            mcts.playout( cells, diarcs, triarcs )
+
+        # for
+
+        return playouts
+
+    # mctsPlayouts
+
+    benchmarks = {
+        "Board.isValidMove"     : isValidMove,
+        "Board.playPiece"       : playPiece,
+        "Board.legalMoves"      : legalMoves,
+        "Game.clone"            : clone,
+        "Board.getRowColumn"    : getRowColumn,
+        "Board.rowColumnToIndex": rowColumnToIndex,
+    }
+    for piece in Piece:
+        benchmarks[ f"Game.checkScore[{piece.name}]" ] = checkScore( game.checkScore, piece )
+
+    # for
+    for pattern in Pattern:
+        for piece in Piece:
+            name = f"checkScore{piece.name.title()}Piece_{pattern.name.title()}"
+            if hasattr( game, name ):
+                benchmarks[ f"Game.{name}" ] = checkScore( getattr( game, name ), piece )
+
+            # if
+        # for
+    # for
+    benchmarks[ "Game.legalCodes playouts" ] = gamePlayouts
+    benchmarks[ "MonteCarloTreeSearch.playout" ] = mctsPlayouts
+
+    results = dict()
+    for name, func in benchmarks.items():
+        seconds, calls = timeCalls( func, repeat )
+        results[ name ] = {
+            "calls"         : calls,
+            "nsPerCall"     : 1e9 * seconds if seconds is not None else None,
+            "callsPerSecond": 1 / seconds if seconds else None,
+        }
+
+    # for
+
+    return results
+
+# benchmarkPosition
+
+
+def _gitCommit():
+    """ The current git commit of the package, None if it is not known """
+    try:
+        return subprocess.run(
+                [ "git", "rev-parse", "HEAD" ], capture_output=True, text=True, check=True,
+                cwd=os.path.dirname( os.path.abspath( __file__ ) )
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    # try
+
+# _gitCommit
+
+
+def runBenchmarks(
+        boards: List[ str ] = None, seed: int = 0, positions: int = 3, repeat: int = 5,
+        playouts: int = 10 ) -> Dict:
+    """ Run the benchmark suite on seeded random positions of each stage
+
+        :param boards: (Optional) names of the board backends to benchmark (default is all of BOARDS)
+        :param seed: the seed of the first position, incremented for each position
+        :param positions: the number of positions of each stage to benchmark
+        :param repeat: the number of timing runs to take the best of
+        :param playouts: the number of random playouts per timing call
+
+        :returns: dict of the run's metadata and results, which is JSON serializable
+    """
+    if boards is None:
+        boards = list( BOARDS )
+
+    # if
+
+    results = [ ]
+    for board_name in boards:
+        for stage, moves in STAGES.items():
+            for i in range( positions ):
+                game = randomPosition( moves, seed + i, BOARDS[ board_name ]() )
+                for name, timing in benchmarkPosition( game, repeat, playouts, seed + i ).items():
+                    results.append( {
+                        "board"    : board_name,
+                        "stage"    : stage,
+                        "position" : i,
+                        "benchmark": name,
+                        **timing,
+                    } )
+
+                # for
+            # for
+        # for
+    # for
+
+    return {
+        "commit"   : _gitCommit(),
+        "timestamp": time.time(),
+        "python"   : platform.python_version(),
+        "numpy"    : np.__version__,
+        "machine"  : platform.machine(),
+        "seed"     : seed,
+        "positions": positions,
+        "repeat"   : repeat,
+        "playouts" : playouts,
+        "results"  : results,
+    }
+
+# runBenchmarks
+
+
+def summarize( run: Dict ):
+    """ Summarize a benchmark run's results, averaging over the positions
+
+        :param run: the benchmark run (see runBenchmarks)
+
+        :returns: dict of (board, stage, benchmark) -> mean nanoseconds per call
+    """
+    timings = dict()
+    for result in run[ "results" ]:
+        if result[ "nsPerCall" ] is None:
+            continue
+
+        # if
+
+        key = (result[ "board" ], result[ "stage" ], result[ "benchmark" ])
+        timings.setdefault( key, [ ] ).append( result[ "nsPerCall" ] )
+
+    # for
+
+    return { key: sum( ns ) / len( ns ) for key, ns in timings.items() }
+
+# summarize
+
+
+def main( args=None ):
+    parser = argparse.ArgumentParser( description="Benchmark move generation, scoring and playouts" )
+    parser.add_argument( "--output", type=str, default=None, help="JSON file to write the results to" )
+    parser.add_argument(
+            "--board", type=str, action="append", choices=list( BOARDS ), default=None,
+            help="board backend to benchmark (default is all)" )
+    parser.add_argument( "--seed", type=int, default=0, help="seed of the first position" )
+    parser.add_argument( "--positions", type=int, default=3, help="positions per stage" )
+    parser.add_argument( "--repeat", type=int, default=5, help="timing runs to take the best of" )
+    parser.add_argument( "--playouts", type=int, default=10, help="random playouts per timing call" )
+    args = parser.parse_args( args )
+
+    run = runBenchmarks( args.board, args.seed, args.positions, args.repeat, args.playouts )
+
+    if args.output is not None:
+        with open( args.output, "w" ) as output_file:
+            json.dump( run, output_file, indent=2 )
+
+        # with
+
+    # if
+
+    for (board, stage, benchmark), ns in summarize( run ).items():
+        print( f"{board:>8} | {stage:>8} | {benchmark:<40} | {ns:12.1f} ns" )
+
+    # for
+
+# main
+
+
+if __name__ == "__main__":
+    main()
+
+# if __main__
@@ -0,0 +1,260 @@
+from typing import List
+
+import numpy as np
+
+# package imports
+from game import Board, Piece
+from player import Player
+
+# indices of the piece types' free locations in Board.freeCells (Piece.value is slow to look up)
+DIARC_INDEX = Piece.DIARC.value
+TRIARC_INDEX = Piece.TRIARC.value
+
+
+class BitBoard( Board ):
+    """ Board backend storing occupancy and ownership as integer bitmasks
+
+        Each player's locations are a single 144-bit mask over the board's cells (see
+        Board.getCell): bit i is diarc location i for i < 90 and triarc location i - 90 above.
+        Placing and removing a piece is a few bitwise operations on plain ints, using
+        precomputed cell bits.
+    """
+    __slots__ = ('cells1', 'cells2', 'occupied')
+
+    FULL_DIARCS = (1 << Board.NUM_DIARCS) - 1
+    FULL_TRIARCS = (1 << Board.NUM_TRIARCS) - 1
+    FULL_CELLS = (1 << Board.NUM_PIECES) - 1
+
+    # location -> bit of its cell, for each piece type
+    DIARC_BITS = tuple( 1 << location for location in range( Board.NUM_DIARCS ) )
+    TRIARC_BITS = tuple( 1 << (Board.NUM_DIARCS + location) for location in range( Board.NUM_TRIARCS ) )
+
+    def __init__( self ):
+        # cell masks of players 1 and 2, and of the occupied cells
+        self.cells1 = 0
+        self.cells2 = 0
+        self.occupied = 0
+
+        super().__init__()
+
+    # __init__
+
+    def copy( self ):
+        """ Copy the board's state """
+        board = object.__new__( type( self ) )
+        board.cells1 = self.cells1
+        board.cells2 = self.cells2
+        board.occupied = self.occupied
+        board.key = self.key
+        board.freeCells = [ free_cells.copy() for free_cells in self.freeCells ]
+
+        return board
+
+    # copy
+
+    def _setOwners( self, owners: List[ int ], offset: int, full: int ):
+        """ Set the owners of a piece type's cells, starting at cell offset """
+        cells = [ 0, 0, 0 ]
+        for i, owner in enumerate( owners ):
+            cells[ owner ] |= 1 << (offset + i)
+
+        # for
+        self.cells1 = (self.cells1 & ~full) | cells[ 1 ]
+        self.cells2 = (self.cells2 & ~full) | cells[ 2 ]
+        self.occupied = self.cells1 | self.cells2
+        self.key = self.computeKey()
+        self.freeCells = self.computeFreeCells()
+
+    # _setOwners
+
+    @property
+    def diarcs( self ) -> List[ int ]:
+        """ List view of the diarc locations' owners (0 if empty), built on every read """
+        return self.toArray()[ :Board.NUM_DIARCS ].tolist()
+
+    @diarcs.setter
+    def diarcs( self, owners: List[ int ] ):
+        self._setOwners( owners, 0, BitBoard.FULL_DIARCS )
+
+    # property: diarcs
+
+    @property
+    def triarcs( self ) -> List[ int ]:
+        """ List view of the triarc locations' owners (0 if empty), built on every read """
+        return self.toArray()[ Board.NUM_DIARCS: ].tolist()
+
+    @triarcs.setter
+    def triarcs( self, owners: List[ int ] ):
+        self._setOwners( owners, Board.NUM_DIARCS, BitBoard.FULL_TRIARCS << Board.NUM_DIARCS )
+
+    # property: triarcs
+
+    def getOwner( self, piece: Piece, location: int ):
+        """ Get the owner of a board location
+
+            :param piece: the piece type of the location
+            :param location: the index of the piece
+
+            :returns: the player number owning the location, 0 if empty
+        """
+        bit = BitBoard.DIARC_BITS[ location ] if piece is Piece.DIARC else BitBoard.TRIARC_BITS[ location ]
+        if self.cells1 & bit:
+            return 1
+
+        elif self.cells2 & bit:
+            return 2
+
+        return 0
+
+    # getOwner
+
+    def getMasks( self, number: int ):
+        """ Get the bitmasks of the locations owned by a player
+
+            :param number: the player's number
+
+            :returns: (diarc mask, triarc mask) with bit i set if the player owns location i
+        """
+        cells = self.cells1 if number == 1 else self.cells2
+
+        return cells & BitBoard.FULL_DIARCS, cells >> Board.NUM_DIARCS
+
+    # getMasks
+
+    def toArray( self ):
+        """ Get the board as an array of its cells' owners (0 if empty)
+
+            Cells 0-89 are the diarc locations and cells 90-143 are the triarc locations.
+
+            :returns: numpy array of the 144 cells' owners
+        """
+        cells = np.zeros( Board.NUM_PIECES, dtype=np.int8 )
+        for number, mask in ((1, self.cells1), (2, self.cells2)):
+            bits = np.unpackbits(
+                    np.frombuffer( mask.to_bytes( 18, "little" ), dtype=np.uint8 ), bitorder="little" )
+            cells[ bits[ :Board.NUM_PIECES ].astype( bool ) ] = number
+
+        # for
+
+        return cells
+
+    # toArray
+
+    def isFilled( self ):
+        """ Check whether the board is filled"""
+        return self.occupied == BitBoard.FULL_CELLS
+
+    # isFilled
+
+    def isValidPlacement( self, piece: Piece, location: int, player: Player ):
+        """ Check if a player can place a piece at a location (see Board.isValidMove) """
+        if piece is Piece.DIARC:
+            return (not self.occupied & BitBoard.DIARC_BITS[ location ]) and (player.diarcs > 0)
+
+        elif piece is Piece.TRIARC:
+            return (not self.occupied & BitBoard.TRIARC_BITS[ location ]) and (player.triarcs > 0)
+
+        return False
+
+    # isValidPlacement
+
+    def placePiece( self, piece: Piece, location: int, player: Player ):
+        """ Place a player's piece at a location (see Board.playPiece)
+
+            :return: boolean of whether operation was successful
+        """
+        number = player.number
+        if piece is Piece.DIARC:
+            bit = BitBoard.DIARC_BITS[ location ]
+            if (self.occupied & bit) or (player.diarcs <= 0):
+                return False
+
+            # if
+            player.diarcs -= 1  # remove a piece from their hand
+            self.key ^= Board.ZOBRIST_DIARCS[ number ][ location ]
+            self.freeCells[ DIARC_INDEX ].discard( location )
+
+        # if
+        elif piece is Piece.TRIARC:
+            bit = BitBoard.TRIARC_BITS[ location ]
+            if (self.occupied & bit) or (player.triarcs <= 0):
+                return False
+
+            # if
+            player.triarcs -= 1  # remove a piece from their hand
+            self.key ^= Board.ZOBRIST_TRIARCS[ number ][ location ]
+            self.freeCells[ TRIARC_INDEX ].discard( location )
+
+        # elif
+        else:
+            return False
+
+        # else
+
+        self.occupied |= bit
+        if number == 1:
+            self.cells1 |= bit
+
+        else:
+            self.cells2 |= bit
+
+        # else
+
+        return True
+
+    # placePiece
+
+    def removePiece( self, piece: Piece, location: int, player: Player ):
+        """ Remove a player's piece from a location, returning it to their hand (see Board.undoPiece)
+
+            :return: boolean of whether operation was successful
+        """
+        number = player.number
+        if piece is Piece.DIARC:
+            bit = BitBoard.DIARC_BITS[ location ]
+
+        elif piece is Piece.TRIARC:
+            bit = BitBoard.TRIARC_BITS[ location ]
+
+        else:
+            return False
+
+        # else
+
+        if number == 1:
+            if not self.cells1 & bit:
+                return False
+
+            # if
+            self.cells1 ^= bit
+
+        # if
+        else:
+            if not self.cells2 & bit:
+                return False
+
+            # if
+            self.cells2 ^= bit
+
+        # else
+        self.occupied ^= bit
+
+        if piece is Piece.DIARC:
+            player.diarcs += 1  # return the piece to their hand
+            self.key ^= Board.ZOBRIST_DIARCS[ number ][ location ]
+            self.freeCells[ DIARC_INDEX ].add( location )
+
+        # if
+        else:
+            player.triarcs += 1  # return the piece to their hand
+            self.key ^= Board.ZOBRIST_TRIARCS[ number ][ location ]
+            self.freeCells[ TRIARC_INDEX ].add( location )
+
+        # else
+
+        return True
+
+    # removePiece
+
+
+# class: BitBoard
@@ -0,0 +1,219 @@
+import argparse
+import struct
+
+from typing import (
+    Dict,
+    Iterable,
+    List,
+)
+
+# package imports
+from game import Game, Board
+from bitboard import BitBoard
+from records import GameRecord, readRecords
+from symmetry import canonicalKey, canonicalMoveCell, inverseCell
+
+# file header: magic bytes, format version, number of entries
+MAGIC = b"DVOB"
+VERSION = 2
+FILE_HEADER = struct.Struct( "<4sBI" )
+
+# entry: canonical position key, canonical cell of the move, games played, half-points scored
+ENTRY = struct.Struct( "<QBII" )
+
+
+class OpeningBook:
+    """ Move statistics of the opening positions of self-play games, keyed by position hash
+
+        Positions are keyed by their canonical Zobrist key (see symmetry.canonicalKey) and moves
+        by their canonical cell (see symmetry.canonicalMoveCell), so symmetric positions and
+        symmetric moves in a position share their statistics. The statistics of a move are the number of games it was played in and
+        the half-points its player scored in them (2 for a win, 1 for a draw).
+    """
+
+    def __init__( self, minGames: int = 1 ):
+        """ OpeningBook constructor
+
+            :param minGames: the number of games a move must have been played in to be chosen
+
+        """
+        self.minGames = minGames
+
+        # canonical key -> canonical cell -> [games, half-points]
+        self.entries: Dict[ int, Dict[ int, List[ int ] ] ] = dict()
+
+    # __init__
+
+    def __len__( self ):
+        return len( self.entries )
+
+    # __len__
+
+    def addRecord( self, record: GameRecord, maxPlies: int ):
+        """ Add the opening moves of a game record to the book
+
+            :param record: the GameRecord to add
+            :param maxPlies: the number of opening moves of the game to add
+
+        """
+        if record.player1Score == record.player2Score:
+            half_points = { 1: 1, 2: 1 }
+
+        else:
+            winner = 1 if record.player1Score > record.player2Score else 2
+            half_points = { winner: 2, 3 - winner: 0 }
+
+        # else
+
+        game = Game( BitBoard() )
+        for cell in record.cells[ :maxPlies ]:
+            key, canonical_cell = canonicalMoveCell( game.board, cell )
+            stats = self.entries.setdefault( key, dict() ).setdefault( canonical_cell, [ 0, 0 ] )
+            stats[ 0 ] += 1
+            stats[ 1 ] += half_points[ game.turn ]
+
+            piece, location = Board.getPieceLocation( cell )
+            if game.make( Board.encodeMove( piece, location, game.turn ) ) is None:
+                raise ValueError( "Invalid move in game record!" )
+
+            # if
+        # for
+
+    # addRecord
+
+    @classmethod
+    def build( cls, records: Iterable[ GameRecord ], maxPlies: int = 12, minGames: int = 1 ):
+        """ Build a book from game records
+
+            :param records: the GameRecords to build the book from (see records.readRecords)
+            :param maxPlies: the number of opening moves of each game to add
+            :param minGames: the number of games a move must have been played in to be chosen
+
+            :returns: the OpeningBook
+        """
+        book = cls( minGames )
+        for record in records:
+            book.addRecord( record, maxPlies )
+
+        # for
+
+        return book
+
+    # build
+
+    def lookup( self, game: Game ):
+        """ Look up the book move of the player to move
+
+            The move with the best average result is chosen, breaking ties by the number of games.
+
+            :param game: the Game to look up
+
+            :returns: Board.Move of the book move, None if the position is not in the book
+        """
+        key, symmetry = canonicalKey( game.board )
+        moves = self.entries.get( key )
+        if not moves:
+            return None
+
+        # if
+
+        best_cell, best_games, best_points = None, 0, 0
+        for cell, (games, half_points) in moves.items():
+            if games < self.minGames:
+                continue
+
+            # if
+            # compare the average results without dividing
+            if (best_cell is None) or \
+                    (half_points * best_games, games) > (best_points * games, best_games):
+                best_cell, best_games, best_points = cell, games, half_points
+
+            # if
+        # for
+
+        if best_cell is None:
+            return None
+
+        # if
+
+        piece, location = Board.getPieceLocation( inverseCell( best_cell, symmetry ) )
+        move = Board.Move( location, piece, game.playerOnDeck )
+
+        return move if game.isValidMove( move ) else None
+
+    # lookup
+
+    def save( self, path: str ):
+        """ Write the book to a binary book file """
+        with open( path, "wb" ) as book_file:
+            num_entries = sum( len( moves ) for moves in self.entries.values() )
+            book_file.write( FILE_HEADER.pack( MAGIC, VERSION, num_entries ) )
+            for key in sorted( self.entries ):
+                for cell, (games, half_points) in sorted( self.entries[ key ].items() ):
+                    book_file.write( ENTRY.pack( key, cell, games, half_points ) )
+
+                # for
+            # for
+        # with
+
+    # save
+
+    @classmethod
+    def load( cls, path: str, minGames: int = 1 ):
+        """ Read a book from a binary book file
+
+            :param path: path of the book file
+            :param minGames: the number of games a move must have been played in to be chosen
+
+            :returns: the OpeningBook
+        """
+        book = cls( minGames )
+        with open( path, "rb" ) as book_file:
+            magic, version, num_entries = FILE_HEADER.unpack( book_file.read( FILE_HEADER.size ) )
+            if magic != MAGIC:
+                raise ValueError( "Not an opening book file!" )
+
+            # if
+            if version != VERSION:
+                raise ValueError( f"Unsupported opening book version: {version}" )
+
+            # if
+
+            data = book_file.read( num_entries * ENTRY.size )
+            if len( data ) < num_entries * ENTRY.size:
+                raise ValueError( "Truncated opening book file!" )
+
+            # if
+        # with
+
+        for key, cell, games, half_points in ENTRY.iter_unpack( data ):
+            book.entries.setdefault( key, dict() )[ cell ] = [ games, half_points ]
+
+        # for
+
+        return book
+
+    # load
+
+
+# class: OpeningBook
+
+
+def main( args=None ):
+    parser = argparse.ArgumentParser( description="Build an opening book from game records" )
+    parser.add_argument( "records", type=str, help="game record file to read" )
+    parser.add_argument( "output", type=str, help="book file to write" )
+    parser.add_argument( "--plies", type=int, default=12, help="opening moves of each game to add" )
+    args = parser.parse_args( args )
+
+    book = OpeningBook.build( readRecords( args.records ), args.plies )
+    book.save( args.output )
+    print( f"Wrote {len( book )} positions to {args.output}" )
+
+# main
+
+
+if __name__ == "__main__":
+    main()
+
+# if __main__
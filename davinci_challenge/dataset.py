@@ -0,0 +1,174 @@
+import argparse
+
+import numpy as np
+
+# package imports
+from game import Game, Board
+from bitboard import BitBoard
+from records import readRecords
+
+# fixed-stride layout of a position: the state before each move of a game
+POSITION_DTYPE = np.dtype( [
+    ("cells", np.int8, (Board.NUM_PIECES,)),  # cell owners (see Board.toArray)
+    ("turn", np.int8),  # number of the player to move
+    ("diarcs", np.int8, (2,)),  # diarcs left for players 1 and 2
+    ("triarcs", np.int8, (2,)),  # triarcs left for players 1 and 2
+    ("scores", np.int16, (2,)),  # scores of players 1 and 2
+    ("move", np.uint8),  # cell played from the position
+    ("winner", np.int8),  # number of the game's winner, 0 for a draw
+    ("finalScores", np.int16, (2,)),  # final scores of players 1 and 2
+] )
+
+
+def indexPath( path: str ):
+    """ Path of the game index of a position dataset """
+    return (path[ :-len( ".npy" ) ] if path.endswith( ".npy" ) else path) + ".index.npy"
+
+# indexPath
+
+
+def exportPositions( records: str, path: str ):
+    """ Export the positions of a game record file to a memory-mappable dataset
+
+        The positions are written to a .npy file of POSITION_DTYPE, and the game index (the
+        offset of each game's first position, plus the total) to a .index.npy file next to it.
+
+        :param records: path of the game record file to read
+        :param path: path of the .npy file to write
+
+        :returns: (number of games, number of positions)
+    """
+    # size the dataset
+    num_games, num_positions = 0, 0
+    for record in readRecords( records ):
+        num_games += 1
+        num_positions += len( record.cells )
+
+    # for
+
+    positions = np.lib.format.open_memmap(
+            path, mode="w+", dtype=POSITION_DTYPE, shape=(num_positions,) )
+    index = np.zeros( num_games + 1, dtype=np.int64 )
+
+    offset = 0
+    for i, record in enumerate( readRecords( records ) ):
+        index[ i ] = offset
+        game_positions = np.zeros( len( record.cells ), dtype=POSITION_DTYPE )
+        if record.player1Score > record.player2Score:
+            game_positions[ "winner" ] = 1
+
+        elif record.player1Score < record.player2Score:
+            game_positions[ "winner" ] = 2
+
+        game_positions[ "finalScores" ] = (record.player1Score, record.player2Score)
+        game_positions[ "move" ] = np.frombuffer( record.cells, dtype=np.uint8 )
+
+        # replay the game, saving the position before each move
+        game = Game( BitBoard() )
+        cells = np.zeros( Board.NUM_PIECES, dtype=np.int8 )
+        for ply, cell in enumerate( record.cells ):
+            position = game_positions[ ply ]
+            position[ "cells" ] = cells
+            position[ "turn" ] = game.turn
+            position[ "diarcs" ] = (game.player1.diarcs, game.player2.diarcs)
+            position[ "triarcs" ] = (game.player1.triarcs, game.player2.triarcs)
+            position[ "scores" ] = (game.player1Score, game.player2Score)
+
+            cells[ cell ] = game.turn
+            piece, location = Board.getPieceLocation( cell )
+            if game.make( Board.Move( location, piece, game.playerOnDeck ) ) is None:
+                raise ValueError( f"Invalid move in game record {i}!" )
+
+            # if
+        # for
+
+        positions[ offset:offset + len( game_positions ) ] = game_positions
+        offset += len( game_positions )
+
+    # for
+    index[ -1 ] = offset
+
+    positions.flush()
+    np.save( indexPath( path ), index )
+
+    return num_games, num_positions
+
+# exportPositions
+
+
+class PositionDataset:
+    """ Read-only, memory-mapped dataset of positions written by exportPositions
+
+        Positions are read straight from the memory-mapped file, so slices are zero-copy views.
+    """
+
+    def __init__( self, path: str ):
+        """ PositionDataset constructor
+
+            :param path: path of the .npy file written by exportPositions
+
+        """
+        self.positions = np.load( path, mmap_mode="r" )
+        self.index = np.load( indexPath( path ) )
+
+        if self.positions.dtype != POSITION_DTYPE:
+            raise ValueError( f"{path} is not a position dataset!" )
+
+        # if
+
+    # __init__
+
+    def __len__( self ):
+        return len( self.positions )
+
+    # __len__
+
+    def __getitem__( self, item ):
+        return self.positions[ item ]
+
+    # __getitem__
+
+    @property
+    def numGames( self ):
+        return len( self.index ) - 1
+
+    # property: numGames
+
+    def getGame( self, game: int ):
+        """ Get the positions of a game as a zero-copy view """
+        return self.positions[ self.index[ game ]:self.index[ game + 1 ] ]
+
+    # getGame
+
+    def sample( self, rng: np.random.Generator, size: int ):
+        """ Sample random positions
+
+            :param rng: the numpy random Generator to draw from
+            :param size: the number of positions to sample
+
+            :returns: array of the sampled positions
+        """
+        return self.positions[ np.sort( rng.integers( 0, len( self ), size ) ) ]
+
+    # sample
+
+
+# class: PositionDataset
+
+
+def main( args=None ):
+    parser = argparse.ArgumentParser( description="Export game record positions to a memory-mapped dataset" )
+    parser.add_argument( "records", type=str, help="game record file to read" )
+    parser.add_argument( "output", type=str, help=".npy dataset file to write" )
+    args = parser.parse_args( args )
+
+    num_games, num_positions = exportPositions( args.records, args.output )
+    print( f"Exported {num_positions} positions from {num_games} games to {args.output}" )
+
+# main
+
+
+if __name__ == "__main__":
+    main()
+
+# if __main__
@@ -1,9 +1,17 @@
+import random
+
+import numpy as np
+
+from array import array
+
 from enum import Enum
 from dataclasses import dataclass
 
 from typing import (
+    Iterator,
     List,
     Tuple,
+    Union,
 )
 
 # package imports
@@ -18,18 +26,118 @@ class Piece( Enum ):
 # enum class: Pieces
 
 
+class Pattern( Enum ):
+    TRIANGLE = 0
+    DIAMOND = 1
+    GEM = 2
+    EYE = 3
+    PYRAMID = 4
+    HOURGLASS = 5
+    STAR = 6
+    CIRCLE = 7
+    FLOWER = 8
+
+
+# enum class: Pattern
+
+
+def _zobristKeys( num_locations: int, seed: int ):
+    """ Random 64-bit Zobrist keys indexed by [owner][location] (owner 0, empty, has all 0 keys)"""
+    rng = random.Random( seed )
+
+    return [ [ 0 ] * num_locations ] + [
+        [ rng.getrandbits( 64 ) for _ in range( num_locations ) ] for _ in range( 2 )
+    ]
+
+# _zobristKeys
+
+
+def _rowColumnTables( off_board: int ):
+    """ Build the row-column lookup tables of the pieces (see Board.getRowColumn)
+
+        Each piece's locations are laid out in runs of consecutive locations alternating between
+        the run's columns, moving a row step further down the board every time the columns repeat.
+
+        :param off_board: the value of row-columns with no location
+
+        :returns: ([piece value][location] -> (row, column), [piece value][row][column] -> location)
+    """
+    # (first location, last location + 1, columns, row step, first row) of each run
+    diarc_runs = [
+        (0, 6, (6,), 1, 0),  # straight
+        (6, 16, (4, 8), 1, 0),  # straight
+        (16, 24, (2, 10), 1, 0),  # straight
+        (24, 30, (0, 12), 1, 0),  # straight
+        (30, 42, (5, 7), 2, 0),  # angled down
+        (42, 54, (5, 7), 2, 1),  # angled up
+        (54, 64, (3, 9), 2, 0),  # angled down
+        (64, 74, (3, 9), 2, 1),  # angled up
+        (74, 82, (1, 11), 2, 0),  # angled down
+        (82, 90, (1, 11), 2, 1),  # angled up
+    ]
+    triarc_runs = [
+        (0, 12, (5, 6), 1, 0),
+        (12, 22, (4, 7), 1, 0),
+        (22, 32, (3, 8), 1, 0),
+        (32, 40, (2, 9), 1, 0),
+        (40, 48, (1, 10), 1, 0),
+        (48, 54, (0, 11), 1, 0),
+    ]
+
+    row_columns, locations = [ ], [ ]
+    for runs in (diarc_runs, triarc_runs):  # ordered by piece value
+        piece_row_columns = [ ]
+        for first, last, cols, step, first_row in runs:
+            for location in range( first, last ):
+                offset = location - first
+                piece_row_columns.append(
+                        (first_row + step * (offset // len( cols )), cols[ offset % len( cols ) ]) )
+
+            # for
+        # for
+
+        num_rows = 1 + max( row for row, _ in piece_row_columns )
+        num_cols = 1 + max( col for _, col in piece_row_columns )
+        piece_locations = [ [ off_board ] * num_cols for _ in range( num_rows ) ]
+        for location, (row, col) in enumerate( piece_row_columns ):
+            piece_locations[ row ][ col ] = location
+
+        # for
+
+        row_columns.append( tuple( piece_row_columns ) )
+        locations.append( tuple( map( tuple, piece_locations ) ) )
+
+    # for
+
+    return tuple( row_columns ), tuple( locations )
+
+# _rowColumnTables
+
+
 class Board:
     """ Class implementation of the board game
 
         Indexing of the board starts from (0,0) for both pieces to be from the top-right to the board
         and increase going down and to the left
     """
+    __slots__ = ('triarcs', 'diarcs', 'key', 'freeCells')
+
     # Parameters of the Board
     # number of pieces
     NUM_PIECES = 144
     NUM_TRIARCS = 54
     NUM_DIARCS = 90
 
+    # Zobrist keys of each (owner, location) for hashing board positions
+    ZOBRIST_DIARCS = _zobristKeys( NUM_DIARCS, seed=0 )
+    ZOBRIST_TRIARCS = _zobristKeys( NUM_TRIARCS, seed=1 )
+
+    # row, column or location that is not on the board
+    OFF_BOARD = -1
+
+    # [piece value][location] -> (row, column) and [piece value][row][column] -> location lookups
+    ROW_COLUMNS, LOCATIONS = _rowColumnTables( OFF_BOARD )
+
     @dataclass
     class Move:
         """ Move
@@ -41,43 +149,206 @@ class Board:
         piece: Piece
         player: Player
 
+        def encode( self ):
+            """ Encode the move as an int (see Board.encodeMove) """
+            return Board.encodeMove( self.piece, self.location, self.player.number )
+
+        # encode
+
     # dataclass: Move
 
+    # encoded moves (see encodeMove) pack the player number above the move's cell
+    MOVE_PLAYER_SHIFT = 8
+    MOVE_CELL_MASK = (1 << MOVE_PLAYER_SHIFT) - 1
+
+    # cell -> (Piece, location) lookup (see getCell)
+    PIECE_LOCATIONS = tuple( (Piece.DIARC, i) for i in range( NUM_DIARCS ) ) + tuple(
+            (Piece.TRIARC, i) for i in range( NUM_TRIARCS ) )
+
     def __init__( self ):
         # initialize board locations
         self.triarcs = [ 0 ] * Board.NUM_TRIARCS
         self.diarcs = [ 0 ] * Board.NUM_DIARCS
 
+        # Zobrist hash of the position, updated incrementally as pieces are played
+        self.key = 0
+
+        # [piece value] free locations of each piece type, updated as pieces are played
+        self.freeCells = self.computeFreeCells()
+
     # __init__
 
+    def copy( self ):
+        """ Copy the board's state """
+        board = object.__new__( type( self ) )
+        board.triarcs = self.triarcs[ : ]
+        board.diarcs = self.diarcs[ : ]
+        board.key = self.key
+        board.freeCells = [ free_cells.copy() for free_cells in self.freeCells ]
+
+        return board
+
+    # copy
+
+    def computeFreeCells( self ):
+        """ Compute the free locations of each piece type from scratch
+
+            :returns: list of the sets of free diarc and triarc locations (indexed by piece value)
+        """
+        free_cells = [ None, None ]
+        free_cells[ Piece.DIARC.value ] = { i for i, owner in enumerate( self.diarcs ) if owner == 0 }
+        free_cells[ Piece.TRIARC.value ] = { i for i, owner in enumerate( self.triarcs ) if owner == 0 }
+
+        return free_cells
+
+    # computeFreeCells
+
+    def computeKey( self ):
+        """ Compute the Zobrist hash of the position from scratch """
+        key = 0
+        for i, owner in enumerate( self.diarcs ):
+            key ^= Board.ZOBRIST_DIARCS[ owner ][ i ]
+
+        for i, owner in enumerate( self.triarcs ):
+            key ^= Board.ZOBRIST_TRIARCS[ owner ][ i ]
+
+        return key
+
+    # computeKey
+
+    def getOwner( self, piece: Piece, location: int ):
+        """ Get the owner of a board location
+
+            :param piece: the piece type of the location
+            :param location: the index of the piece
+
+            :returns: the player number owning the location, 0 if empty
+        """
+        if piece is Piece.DIARC:
+            return self.diarcs[ location ]
+
+        return self.triarcs[ location ]
+
+    # getOwner
+
+    def getMasks( self, number: int ):
+        """ Get the bitmasks of the locations owned by a player
+
+            :param number: the player's number
+
+            :returns: (diarc mask, triarc mask) with bit i set if the player owns location i
+        """
+        diarc_mask = sum( 1 << i for i, owner in enumerate( self.diarcs ) if owner == number )
+        triarc_mask = sum( 1 << i for i, owner in enumerate( self.triarcs ) if owner == number )
+
+        return diarc_mask, triarc_mask
+
+    # getMasks
+
+    def toArray( self ):
+        """ Get the board as an array of its cells' owners (0 if empty)
+
+            Cells 0-89 are the diarc locations and cells 90-143 are the triarc locations.
+
+            :returns: numpy array of the 144 cells' owners
+        """
+        return np.array( self.diarcs + self.triarcs, dtype=np.int8 )
+
+    # toArray
+
     def isFilled( self ):
         """ Check whether the board is filled"""
-        return not any(
-                map(
-                        lambda p: p == 0,
-                        self.diarcs + self.triarcs ) )  # check if any board pieces empty
+        # check if any board pieces empty
+        return (0 not in self.diarcs) and (0 not in self.triarcs)
 
     # isFilled
 
-    def isValidMove( self, move: Move ):
-        """ Check if the move is valid """
+    def isValidMove( self, move: Union[ Move, int ], player: Player = None ):
+        """ Check if the move is valid
+
+            :param move: the Move, or the encoded move (see encodeMove), to check
+            :param player: the player of an encoded move (the board does not hold the players)
+
+        """
+        return self.isValidPlacement( *Board.unpackMove( move, player ) )
+
+    # isValidMove
+
+    def isValidPlacement( self, piece: Piece, location: int, player: Player ):
+        """ Check if a player can place a piece at a location (see isValidMove) """
         if (
-            (move.piece is Piece.DIARC)
-            and (self.diarcs[move.location ] == 0)
-            and (move.player.diarcs > 0)
+            (piece is Piece.DIARC)
+            and (self.diarcs[location ] == 0)
+            and (player.diarcs > 0)
         ):
             return True
         
         if (
-            (move.piece is Piece.TRIARC)
-            and (self.triarcs[move.location ] == 0)
-            and (move.player.triarcs > 0)
+            (piece is Piece.TRIARC)
+            and (self.triarcs[location ] == 0)
+            and (player.triarcs > 0)
         ):
             return True
 
         return False
 
-    # isValidMove
+    # isValidPlacement
+
+    def legalMoves( self, player: Player ) -> Iterator[ Move ]:
+        """ Generate the valid moves of a player
+
+            Only the free locations of the piece types the player has left are visited. The
+            free locations are snapshotted up front, so moves can be made while iterating.
+
+            :param player: the player to generate the moves of
+
+            :returns: generator of the valid Board.Moves
+        """
+        for piece, num_pieces in ((Piece.DIARC, player.diarcs), (Piece.TRIARC, player.triarcs)):
+            if num_pieces > 0:
+                for location in tuple( self.freeCells[ piece.value ] ):
+                    yield Board.Move( location, piece, player )
+
+                # for
+            # if
+        # for
+
+    # legalMoves
+
+    def legalCells( self, player: Player ) -> Iterator[ int ]:
+        """ Generate the valid moves of a player as cell indices (see getCell)
+
+            :param player: the player to generate the moves of
+
+            :returns: generator of the valid moves' cells
+        """
+        if player.diarcs > 0:
+            yield from tuple( self.freeCells[ Piece.DIARC.value ] )
+
+        # if
+        if player.triarcs > 0:
+            yield from [
+                Board.NUM_DIARCS + location for location in self.freeCells[ Piece.TRIARC.value ]
+            ]
+
+        # if
+
+    # legalCells
+
+    def legalCodes( self, player: Player ) -> Iterator[ int ]:
+        """ Generate the valid moves of a player as encoded moves (see encodeMove)
+
+            :param player: the player to generate the moves of
+
+            :returns: generator of the valid moves' codes
+        """
+        player_bits = player.number << Board.MOVE_PLAYER_SHIFT
+        for cell in self.legalCells( player ):
+            yield player_bits | cell
+
+        # for
+
+    # legalCodes
 
     @staticmethod
     def getRowColumn( piece: Piece, location: int ):
@@ -117,223 +388,227 @@ class Board:
             :param piece: the piece to get the row and column of
             :param location: the index of the piece
 
-            :returns: (row, column) of the piece's location
+            :returns: (row, column) of the piece's location. (OFF_BOARD, OFF_BOARD) if the location
+                      is not on the board
 
         """
-        row, col = None, None
-        if piece is Piece.DIARC:
-            if 0 <= location < 6:  # column 6
-                col = 6
-                row = location
+        row_columns = Board.ROW_COLUMNS[ piece.value ]
+        if 0 <= location < len( row_columns ):
+            return row_columns[ location ]
 
-            elif 6 <= location < 16:  # columns 4 and 8
-                col = 4 if location % 2 == 0 else 8
-                row = (location - 6) // 2
+        # if
 
-            elif 16 <= location < 24:  # columns 2 and 10
-                col = 2 if location % 2 == 0 else 10
-                row = (location - 16) // 2
+        return Board.OFF_BOARD, Board.OFF_BOARD
 
-            elif 24 <= location < 30:  # columns 0 and 12
-                col = 0 if location % 2 == 0 else 12
-                row = (location - 24) // 2
+    # getRowColumn
 
-            elif 30 <= location < 42:  # columns 5 and 7 angled down
-                col = 5 if location % 2 == 0 else 7
-                row = 2 * ((location - 30) // 2)
+    @staticmethod
+    def rowColumnToIndex( piece: Piece, row: int, col: int ):
+        """ Convert the row-column format to a list index
 
-            elif 42 <= location < 54:  # columns 5 and 7 angled up
-                col = 5 if location % 2 == 0 else 7
-                row = 2 * ((location - 42) // 2) + 1
+            :returns list index of the point. OFF_BOARD if there is no piece at the row-column
 
-            elif 54 <= location < 64:  # columns 3 and 9 angled down
-                col = 3 if location % 2 == 0 else 9
-                row = 2 * ((location - 54) // 2)
+        """
+        locations = Board.LOCATIONS[ piece.value ]
+        if (0 <= row < len( locations )) and (0 <= col < len( locations[ 0 ] )):
+            return locations[ row ][ col ]
 
-            elif 64 <= location < 74:  # columns 3 and 9 angled up
-                col = 3 if location % 2 == 0 else 9
-                row = 2 * ((location - 64) // 2) + 1
+        # if
+
+        return Board.OFF_BOARD
 
-            elif 74 <= location < 82:  # columns 1 and 11 angled down
-                col = 1 if location % 2 == 0 else 11
-                row = 2 * ((location - 74) // 2)
+    # rowColumnToIndex
 
-            elif 82 <= location < 90:  # columns 1 and 11 angled up
-                col = 1 if location % 2 == 0 else 11
-                row = 2 * ((location - 82) // 2) + 1
+    @staticmethod
+    def getCell( piece: Piece, location: int ):
+        """ Get the cell index of a location (diarcs are cells 0-89, triarcs are cells 90-143) """
+        return location if piece is Piece.DIARC else Board.NUM_DIARCS + location
 
-        # if: diarc
-        elif piece is Piece.TRIARC:
-            if 0 <= location < 12:  # columns 5 and 6
-                col = 5 if location % 2 == 0 else 6
-                row = location // 2
+    # getCell
 
-            elif 12 <= location < 22:  # columns 4 and 7
-                col = 4 if location % 2 == 0 else 7
-                row = (location - 12) // 2
+    @staticmethod
+    def getPieceLocation( cell: int ):
+        """ Get the (Piece, location) of a cell index (see getCell) """
+        return Board.PIECE_LOCATIONS[ cell ]
 
-            elif 22 <= location < 32:  # columns 3 and 8
-                col = 3 if location % 2 == 0 else 8
-                row = (location - 22) // 2
+    # getPieceLocation
 
-            elif 32 <= location < 40:  # columns 2 and 9
-                col = 2 if location % 2 == 0 else 9
-                row = (location - 32) // 2
+    @staticmethod
+    def encodeMove( piece: Piece, location: int, number: int ):
+        """ Encode a move as a small int packing the player number with the move's cell
 
-            elif 40 <= location < 48:  # columns 1 and 10
-                col = 1 if location % 2 == 0 else 10
-                row = (location - 40) // 2
+            :param piece: the piece type of the move
+            :param location: the index of the piece
+            :param number: the number of the player playing the move
 
-            elif 48 <= location < 54:  # columns 0 and 11
-                col = 0 if location % 2 == 0 else 11
-                row = (location - 48) // 2
+            :returns: the encoded move
 
-        # elif: triarc
+            :raises ValueError: if the location is not on the board
+        """
+        num_locations = Board.NUM_DIARCS if piece is Piece.DIARC else Board.NUM_TRIARCS
+        if not (0 <= location < num_locations):
+            raise ValueError( f"{piece.name.title()} location {location} is not on the board!" )
 
-        return row, col
+        # if
 
-    # getRowColumn
+        return number << Board.MOVE_PLAYER_SHIFT | Board.getCell( piece, location )
+
+    # encodeMove
 
     @staticmethod
-    def rowColumnToIndex( piece: Piece, row: int, col: int ):
-        """ Convert the row-column format to a list index
+    def decodeMove( code: int ):
+        """ Decode an encoded move (see encodeMove)
+
+            :returns: (Piece, location, player number) of the move
+        """
+        code = int( code )
+        piece, location = Board.PIECE_LOCATIONS[ code & Board.MOVE_CELL_MASK ]
+
+        return piece, location, code >> Board.MOVE_PLAYER_SHIFT
+
+    # decodeMove
+
+    @staticmethod
+    def getMovePiece( move: Union[ Move, int ] ):
+        """ Get the piece type of a Move or an encoded move """
+        if isinstance( move, Board.Move ):
+            return move.piece
+
+        # if
+
+        # any other move is an encoded move, e.g. an int or a numpy integer
+        return Board.PIECE_LOCATIONS[ int( move ) & Board.MOVE_CELL_MASK ][ 0 ]
+
+    # getMovePiece
+
+    @staticmethod
+    def unpackMove( move: Union[ Move, int ], player: Player = None ):
+        """ Unpack a Move or an encoded move
 
-            :returns list index of the point. None if not found
+            :param move: the Move or the encoded move (see encodeMove)
+            :param player: the player of an encoded move, which is not needed for a Move
 
+            :returns: (Piece, location, Player) of the move
+
+            :raises ValueError: if the player of an encoded move is missing or is not the player
+                                it was encoded with
         """
-        location = None
+        if isinstance( move, Board.Move ):
+            return move.piece, move.location, move.player
 
-        if col == 0:
-            if piece is Piece.DIARC:
-                location = 2 * row + 24
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 48
         # if
-        elif col == 1:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 74
-                else:  # angled up
-                    location = row + 82 - 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 40
-        # elif
-        elif col == 2:
-            if piece is Piece.DIARC:
-                location = 2 * row + 16
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 32
-        # elif
-        elif col == 3:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 54
-                else:  # angled up
-                    location = row + 64 - 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 22
-        # elif
-        elif col == 4:
-            if piece is Piece.DIARC:
-                location = 2 * row + 6
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 12
-        # elif
-        elif col == 5:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 30
-                else:  # angled up
-                    location = row + 42 - 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row
-        # elif
-        elif col == 6:
-            if piece is Piece.DIARC:
-                location = row
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 1
-        # elif
-        elif col == 7:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 30 + 1
-                else:  # angled up
-                    location = row + 42 - 1 + 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 12 + 1
-        # elif
-        elif col == 8:
-            if piece is Piece.DIARC:
-                location = 2 * row + 6 + 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 22 + 1
-        # elif
-        elif col == 9:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 54 + 1
-                else:  # angled up
-                    location = row + 64 - 1 + 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 32 + 1
-        # elif
-        elif col == 10:
-            if piece is Piece.DIARC:
-                location = 2 * row + 16 + 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 40 + 1
-        # elif
-        elif col == 11:
-            if piece is Piece.DIARC:
-                if row % 2 == 0:  # angled down
-                    location = row + 74 + 1
-                else:  # angled up
-                    location = row + 82 - 1 + 1
-            elif piece is Piece.TRIARC:
-                location = 2 * row + 48 + 1
-        # elif
-        elif col == 12 and piece is Piece.DIARC:
-            location = 2 * row + 24 + 1
 
-        # elif: DIARC
+        # any other move is an encoded move, e.g. an int or a numpy integer
+        move = int( move )
+        if player is None:
+            raise ValueError( "The player of an encoded move must be given!" )
 
-        return location
+        # if
+        if player.number != move >> Board.MOVE_PLAYER_SHIFT:
+            raise ValueError( f"Encoded move {move} is not a move of player {player.number}!" )
 
-    # rowColumnToIndex
+        # if
+        piece, location = Board.PIECE_LOCATIONS[ move & Board.MOVE_CELL_MASK ]
+
+        return piece, location, player
 
-    def playPiece( self, move: Move ):
+    # unpackMove
+
+    def playPiece( self, move: Union[ Move, int ], player: Player = None ):
         """ Player plays a piece on the board
 
             Operation will not be successful if any are true:
                 - location is already taken
                 - player does not have enough of pieces of type "piece"
 
-            :param move: Move object that is being performed
+            :param move: Move object, or encoded move (see encodeMove), that is being performed
+            :param player: the player of an encoded move (the board does not hold the players)
 
             :return: boolean of whether operation was successful
         """
+        return self.placePiece( *Board.unpackMove( move, player ) )
+
+    # playPiece
+
+    def placePiece( self, piece: Piece, location: int, player: Player ):
+        """ Place a player's piece at a location (see playPiece)
 
-        valid_move = self.isValidMove( move )  # operation successful or not
-        if move.piece is Piece.DIARC and valid_move:
-            self.diarcs[ move.location ] = move.player.number
-            move.player.diarcs -= 1  # remove a piece from their hand
+            :return: boolean of whether operation was successful
+        """
+        valid_move = self.isValidPlacement( piece, location, player )  # operation successful or not
+        if piece is Piece.DIARC and valid_move:
+            self.diarcs[ location ] = player.number
+            self.key ^= Board.ZOBRIST_DIARCS[ player.number ][ location ]
+            player.diarcs -= 1  # remove a piece from their hand
 
         # if
-        elif move.piece is Piece.TRIARC and valid_move:
-            self.triarcs[ move.location ] = move.player.number
-            move.player.triarcs -= 1  # remove a piece from their hand
+        elif piece is Piece.TRIARC and valid_move:
+            self.triarcs[ location ] = player.number
+            self.key ^= Board.ZOBRIST_TRIARCS[ player.number ][ location ]
+            player.triarcs -= 1  # remove a piece from their hand
 
         # elif
 
+        if valid_move:
+            self.freeCells[ piece.value ].discard( location )
+
+        # if
+
         return valid_move
 
-    # playPiece
+    # placePiece
+
+    def undoPiece( self, move: Union[ Move, int ], player: Player = None ):
+        """ Take back a piece played on the board and return it to the player's hand
+
+            Operation will not be successful if the location is not owned by the move's player
+
+            :param move: Move object, or encoded move (see encodeMove), that was performed
+            :param player: the player of an encoded move (the board does not hold the players)
+
+            :return: boolean of whether operation was successful
+        """
+        return self.removePiece( *Board.unpackMove( move, player ) )
+
+    # undoPiece
+
+    def removePiece( self, piece: Piece, location: int, player: Player ):
+        """ Remove a player's piece from a location, returning it to their hand (see undoPiece)
+
+            :return: boolean of whether operation was successful
+        """
+        if piece is Piece.DIARC and self.diarcs[ location ] == player.number:
+            self.diarcs[ location ] = 0
+            self.key ^= Board.ZOBRIST_DIARCS[ player.number ][ location ]
+            self.freeCells[ Piece.DIARC.value ].add( location )
+            player.diarcs += 1  # return the piece to their hand
+
+            return True
+
+        # if
+        elif piece is Piece.TRIARC and self.triarcs[ location ] == player.number:
+            self.triarcs[ location ] = 0
+            self.key ^= Board.ZOBRIST_TRIARCS[ player.number ][ location ]
+            self.freeCells[ Piece.TRIARC.value ].add( location )
+            player.triarcs += 1  # return the piece to their hand
+
+            return True
+
+        # elif
+
+        return False
+
+    # removePiece
 
 
 # class: Board
 
 class Game:
+    __slots__ = (
+        'board', 'player1', 'player2', 'player1Score', 'player2Score', 'turn', '_undoStack',
+        'patternCounts', 'completedPatterns', 'nearCompletions',
+    )
+
     # pieces each player starts off with
     START_DIARCS = Board.NUM_DIARCS // 2
     START_TRIARCS = Board.NUM_TRIARCS // 2
@@ -349,12 +624,21 @@ class Game:
     POINT_CIRCLE = 25
     POINT_FLOWER = 25
 
-    def __init__( self ):
-        self.board = Board()
+    def __init__( self, board: Board = None, player1: Player = None, player2: Player = None ):
+        """ Game constructor
+
+            :param board: (Optional) an empty board backend to play on (default is a new Board)
+            :param player1: (Optional) the first player, e.g. an AI (default is a new Player)
+            :param player2: (Optional) the second player, e.g. an AI (default is a new Player)
+
+        """
+        self.board = board if board is not None else Board()
 
         # instantiate players
-        self.player1 = Player( 1, Game.START_DIARCS, Game.START_TRIARCS )
-        self.player2 = Player( 2, Game.START_DIARCS, Game.START_TRIARCS )
+        self.player1 = player1 if player1 is not None else Player(
+                1, Game.START_DIARCS, Game.START_TRIARCS )
+        self.player2 = player2 if player2 is not None else Player(
+                2, Game.START_DIARCS, Game.START_TRIARCS )
 
         # initialize the player scores
         self.player1Score = 0
@@ -363,8 +647,89 @@ class Game:
         # start player turn keeping
         self.turn = 1
 
+        # (move, score update, turn before the move) of each move made, for unmake
+        self._undoStack = [ ]
+
+        # [player number][instance] number of cells of each pattern instance (see PatternTable)
+        # owned by the player, and [player number] numbers of pattern instances completed and
+        # one piece from completion by the player, updated incrementally on make and unmake
+        self.patternCounts = [ None ]
+        self.completedPatterns = [ 0 ] * 3
+        self.nearCompletions = [ 0 ] * 3
+        self.resetPatternCounts()
+
     # __init__
 
+    def clone( self ):
+        """ Copy the game's state, e.g. for a search branch or a rollout
+
+            The clone has its own board and copies of the players (AIs share their engines), and
+            can take back the moves made before cloning.
+
+            :returns: the cloned Game
+        """
+        game = object.__new__( type( self ) )
+        game.board = self.board.copy()
+        game.player1 = self.player1.copy()
+        game.player2 = self.player2.copy()
+        game.player1Score = self.player1Score
+        game.player2Score = self.player2Score
+        game.turn = self.turn
+        game._undoStack = self._undoStack[ : ]
+        game.patternCounts = [ None, self.patternCounts[ 1 ][ : ], self.patternCounts[ 2 ][ : ] ]
+        game.completedPatterns = self.completedPatterns[ : ]
+        game.nearCompletions = self.nearCompletions[ : ]
+
+        return game
+
+    # clone
+
+    def getState( self ):
+        """ Pack the game's state into a single flat buffer, e.g. to send to a worker process
+
+            The buffer holds the 144 cells' owners (see Board.toArray), then each player's
+            remaining diarcs and triarcs, the players' scores and the turn.
+
+            :returns: array of the game's state
+        """
+        state = array( 'h', self.board.toArray().astype( np.int16 ).tobytes() )
+        state.extend( (
+            self.player1.diarcs, self.player1.triarcs, self.player2.diarcs, self.player2.triarcs,
+            self.player1Score, self.player2Score, self.turn,
+        ) )
+
+        return state
+
+    # getState
+
+    @classmethod
+    def fromState( cls, state, board: Board = None ):
+        """ Rebuild a game from a flat state buffer (see getState)
+
+            The game has no move history, so it cannot unmake the moves leading to the state.
+
+            :param state: the game's state buffer
+            :param board: (Optional) an empty board backend to play on (default is a new Board)
+
+            :returns: the Game of the state
+        """
+        game = cls( board )
+        cells = list( state[ :Board.NUM_PIECES ] )
+        game.board.diarcs = cells[ :Board.NUM_DIARCS ]
+        game.board.triarcs = cells[ Board.NUM_DIARCS: ]
+        game.board.key = game.board.computeKey()
+        game.board.freeCells = game.board.computeFreeCells()
+
+        (
+            game.player1.diarcs, game.player1.triarcs, game.player2.diarcs, game.player2.triarcs,
+            game.player1Score, game.player2Score, game.turn,
+        ) = state[ Board.NUM_PIECES: ]
+        game.resetPatternCounts()
+
+        return game
+
+    # fromState
+
     @property
     def playerOnDeck( self ):
         if self.turn == 1:
@@ -373,474 +738,451 @@ class Game:
             return self.player2
 
     # property: playerOnDeck
-    
-    def _checkListofLocationsScores(
-            self, 
-            check_piece_row_columns: List[Tuple[Piece, int, int]], 
-            player: Player = None,
-        ):
-        check_indices = [ 
-            Board.rowColumnToIndex( piece, row, col ) 
-            for piece, row, col in
-            check_piece_row_columns
+
+    @property
+    def history( self ) -> List[ Board.Move ]:
+        """ The moves made in the game so far, in order """
+        return [
+            move if isinstance( move, Board.Move ) else self.decodeMove( move ) for move, _, _ in self._undoStack
         ]
 
-        # check if
-        does_score = True
-        for idx, (piece, row, col) in zip(check_indices, check_piece_row_columns):
-            if idx is None:  # not a valid piece
-                does_score = False
-                break
+    # property: history
 
-            # if
+    def getPlayer( self, number: int ):
+        """ Get a player by their number """
+        return self.player1 if number == 1 else self.player2
+
+    # getPlayer
+
+    def _unpackMove( self, move: Union[ Board.Move, int ] ):
+        """ Unpack a Board.Move or an encoded move (see Board.encodeMove)
+
+            The move's player is resolved to this game's player of the same number, so moves
+            made in a game can be taken back from its clones.
+
+            :returns: (Piece, location, Player, cell) of the move
+        """
+        if isinstance( move, Board.Move ):
+            return (
+                move.piece, move.location, self.getPlayer( move.player.number ),
+                Board.getCell( move.piece, move.location ),
+            )
+
+        # if
+
+        # any other move is an encoded move, e.g. an int or a numpy integer
+        move = int( move )
+        cell = move & Board.MOVE_CELL_MASK
+        piece, location = Board.PIECE_LOCATIONS[ cell ]
 
-            player_piece_num = self.board.diarcs[idx] if piece is Piece.DIARC else self.board.triarcs[idx]
+        return piece, location, self.getPlayer( move >> Board.MOVE_PLAYER_SHIFT ), cell
 
-            if (
-                (player is not None) 
-                and ( player_piece_num != player.number)
-            ):  # not a piece already played by other players
-                does_score = False
-                break
+    # _unpackMove
+
+    def decodeMove( self, code: int ):
+        """ Decode an encoded move (see Board.encodeMove) into a Board.Move of this game's players """
+        piece, location, number = Board.decodeMove( code )
+
+        return Board.Move( location, piece, self.getPlayer( number ) )
+
+    # decodeMove
+
+    def resetPatternCounts( self ):
+        """ Recount the pattern instance counters from the board, e.g. after it was set directly """
+        cells = self.board.toArray()
+        self.patternCounts = [ None ] + [
+            [ int( owned ) for owned in PATTERN_TABLE.incidence @ (cells == number).astype( np.float32 ) ]
+            for number in (1, 2)
+        ]
+        for number in (1, 2):
+            counts, other_counts = self.patternCounts[ number ], self.patternCounts[ 3 - number ]
+            self.completedPatterns[ number ] = sum(
+                    owned == size for owned, size in zip( counts, PATTERN_TABLE.instanceSizes ) )
+            self.nearCompletions[ number ] = sum(
+                    (owned == size - 1) and (other == 0)
+                    for owned, other, size in zip( counts, other_counts, PATTERN_TABLE.instanceSizes ) )
+
+        # for
+
+    # resetPatternCounts
+
+    def _updatePatternCounts( self, cell: int, number: int, delta: int ):
+        """ Update the pattern instance counters for a piece played (delta=1) or taken back (delta=-1)
+
+            :param cell: the cell of the piece (see Board.getCell)
+            :param number: the number of the piece's player
+            :param delta: 1 if the piece was played, -1 if it was taken back
+
+            :returns: total points of the pattern instances completed or uncompleted by the piece
+        """
+        counts, other_counts = self.patternCounts[ number ], self.patternCounts[ 3 - number ]
+        near_completions = 0
+        other_near_completions = 0
+        completed = 0
+        points = 0
+        for i in PATTERN_TABLE.cellInstances[ cell ]:
+            size = PATTERN_TABLE.instanceSizes[ i ]
+            owned, other = counts[ i ], other_counts[ i ]
+            counts[ i ] = owned + delta
+
+            # instances one piece from completion can only be completed with no opponent pieces
+            near_completions += ((owned + delta == size - 1) - (owned == size - 1)) * (other == 0)
+            if other == size - 1:
+                other_near_completions += (owned + delta == 0) - (owned == 0)
+
+            # if
+
+            if max( owned, owned + delta ) == size:
+                completed += delta
+                points += PATTERN_TABLE.instancePoints[ i ]
 
             # if
-            elif (
-                (player is None)
-                and self.board.diarcs[idx] not in [self.player1.number, self.player2.number]
-            ):
-                does_score = False
-                break
-
-            # elif
-            
         # for
 
-        return does_score
+        self.nearCompletions[ number ] += near_completions
+        self.nearCompletions[ 3 - number ] += other_near_completions
+        self.completedPatterns[ number ] += completed
 
-    def checkScore( self, move: Board.Move ):
-        """ Function to check if a play was a scoring play
+        return points
 
-            :param move: Board.Move of the move to be queried
+    # _updatePatternCounts
 
-            :return: total score of a particular move
+    def _checkPatternScore( self, move: Union[ Board.Move, int ], pattern: Pattern = None ):
+        """ Sum the points of the pattern instances a move would complete
+
+            :param move: Union[ Board.Move, int ] of the move to be queried
+            :param pattern: (Optional) only check instances of this Pattern (default is all patterns)
+
+            :return: total score of the completed pattern instances
         """
-        if not self.isValidMove(move):
+        # check if it is a valid move
+        piece, location, player, cell = self._unpackMove( move )
+        if not self.board.isValidPlacement( piece, location, player ):
             return 0
-        
+
+        # if
+
+        # instances whose other cells are all owned by the player
+        counts = self.patternCounts[ player.number ]
         score = 0
-        if move.piece is Piece.DIARC:
-            score += self.checkScoreDiarcPiece( move )
+        for i in PATTERN_TABLE.cellInstances[ cell ]:
+            if (counts[ i ] == PATTERN_TABLE.instanceSizes[ i ] - 1) and (
+                    (pattern is None) or (PATTERN_TABLE.instances[ i ].pattern is pattern)):
+                score += PATTERN_TABLE.instancePoints[ i ]
 
-        else:
-            score += self.checkScoreTriarcPiece( move )
+            # if
+        # for
 
         return score
 
+    # _checkPatternScore
+
+    def checkScore( self, move: Union[ Board.Move, int ] ):
+        """ Function to check if a play was a scoring play
+
+            :param move: Union[ Board.Move, int ] of the move to be queried
+
+            :return: total score of a particular move
+        """
+        return self._checkPatternScore( move )
+
     # checkScore
 
-    def checkScoreDiarcPiece( self, move: Board.Move ):
+    def checkScoreDiarcPiece( self, move: Union[ Board.Move, int ] ):
         """ Function ot check if a Diarc placement is a scoring play
 
-            :param move: Board.Move of the move to be queried
+            :param move: Union[ Board.Move, int ] of the move to be queried
 
             :return: total score of a particular move
         """
-        score = 0
+        if Board.getMovePiece( move ) is not Piece.DIARC:
+            return 0
 
-        # add scores
-        score += self.checkScoreDiarcPiece_Triangle( move )
-        score += self.checkScoreDiarcPiece_Eye( move )
-        score += self.checkScoreDiarcPiece_Gem( move )
-        score += self.checkScoreDiarcPiece_Flower( move )
-        score += self.checkScoreDiarcPiece_Circle( move )
-        score += self.checkScoreDiarcPiece_Hourglass( move )
-        score += self.checkScoreDiarcPiece_Diamond( move )
+        # if
 
-        return score
+        return self._checkPatternScore( move )
 
     # checkScoreDiarcPiece
 
-    def checkScoreDiarcPiece_Circle( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Circle( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Circle arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
-
-        # TODO: implement valid moves
 
-        # check valid moves
-        score = 0
-
-        return score
+        return self._checkPatternScore( move, Pattern.CIRCLE )
 
     # checkScoreDiarcPiece_Circle
 
-    def checkScoreDiarcPiece_Diamond( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Diamond( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Diamond arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
 
-        row, col = self.board.getRowColumn(move.piece, move.location)
-
-        if col % 2 == 0:
-            check_locations = [
-                (Piece.TRIARC, row, 11 - col),
-                (Piece.TRIARC, row, 12 - col),
-            ]
-
-        else: # diagonal triarc
-            if col < 6:
-                if row % 2 == 0: # bottom-left to top-right slanted dirarc
-                    check_locations = [
-                        (Piece.TRIARC, row//2 - 1, col),
-                        (Piece.TRIARC, row//2, col),
-                    ]
-                else:
-                    check_locations = [
-                        (Piece.TRIARC, row, 11 - col),
-                        (Piece.TRIARC, row, 12 - col),
-                    ]
-
-            elif col > 6:
-                if row % 2 == 0:
-                    check_locations = [
-                        (Piece.TRIARC, row//2 - 1, 12 - col),
-                        (Piece.TRIARC, row//2, 11 - col),
-                    ]
-
-                else: # bottom-left to top-right slanted dirarc
-                    check_locations = [
-                        (Piece.TRIARC, (row - 1)//2, 11 - col),
-                        (Piece.TRIARC, (row - 1)//2, 12 - col),
-                    ]
-
-        # check valid moves
-        score = 0
-        if self._checkListofLocationsScores(check_locations, player=move.player):
-            score += self.POINT_DIAMOND
-
-        return score
+        return self._checkPatternScore( move, Pattern.DIAMOND )
 
     # checkScoreDiarcPiece_Diamond
 
-    def checkScoreDiarcPiece_Eye( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Eye( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Eye arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
 
-        # elif
-
-        # TODO: implement valid moves
-
-        # check valid moves
-        score = 0
-
-        return score
+        return self._checkPatternScore( move, Pattern.EYE )
 
     # checkScoreDiarcPiece_Eye
 
-    def checkScoreDiarcPiece_Flower( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Flower( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Flower arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
-
-        # TODO: implement valid moves
 
-        # check valid moves
-        score = 0
-
-        return score
+        return self._checkPatternScore( move, Pattern.FLOWER )
 
     # checkScoreDiarcPiece_Flower
 
-    def checkScoreDiarcPiece_Gem( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Gem( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Gem arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
 
-        # TODO: implement valid moves
-
-        # check valid moves
-        score = 0
-
-        return score
+        return self._checkPatternScore( move, Pattern.GEM )
 
     # checkScoreDiarcPiece_Gem
 
-    def checkScoreDiarcPiece_Hourglass( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Hourglass( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Hourglass arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
 
-        # TODO: implement valid moves
-
-        # check valid moves
-        score = 0
-
-        return score
+        return self._checkPatternScore( move, Pattern.HOURGLASS )
 
     # checkScoreDiarcPiece_Hourglass
 
-    def checkScoreDiarcPiece_Triangle( self, move: Board.Move ):
+    def checkScoreDiarcPiece_Triangle( self, move: Union[ Board.Move, int ] ):
         """ Check if any points are added from Triangle arrangement
             after placing a Diarc
 
         """
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
+        if Board.getMovePiece( move ) is not Piece.DIARC:
             return 0
 
         # if
-        elif move.piece is not Piece.DIARC:
-            return 0
-
-        # elif
-
-        row, col = Board.getRowColumn( move.piece, move.location )
-
-        # check for triangles
-        if col % 2 == 0:  # straight up and down
-            if col == 6: # middle of board
-                check_locations = [
-                    [ (Piece.DIARC, 2 * row, col - 1), (Piece.DIARC, 2 * row + 1, col - 1) ],
-                    [ (Piece.DIARC, 2 * row, col + 1), (Piece.DIARC, 2 * row + 1, col + 1) ]
-                ]
-            # if
-            elif col < 6: # right-side of board
-                check_locations = [
-                    [ (Piece.DIARC, 2 * row, col + 1), (Piece.DIARC, 2 * row + 1, col + 1) ],
-                    [ (Piece.DIARC, 2 * row + 1, col - 1), (Piece.DIARC, 2 * row + 2, col - 1) ]
-                ]
-            # elif
-            else:  # col > 6 : left-side of board
-                check_locations = [
-                    [ (Piece.DIARC, 2 * row + 1, col - 1), (Piece.DIARC, 2 * row + 2, col - 1) ],
-                    [ (Piece.DIARC, 2 * row, col + 1), (Piece.DIARC, 2 * row + 1, col + 1) ]
-                ]
-            # else
-
-        else:  # angled to left and right
-            # angled bottom-left to top-right, right-side
-            if row % 2 == 1 and col < 6:
-                check_locations = [
-                    [ (Piece.DIARC, row - 1, col), (Piece.DIARC, row // 2, col + 1) ],
-                    [ (Piece.DIARC, row + 1, col), (Piece.DIARC, row // 2, col - 1) ]
-                ]
-
-            # angled bottom-right to top-left, right-side
-            elif row % 2 == 0 and col < 6:
-                check_locations = [
-                    [ (Piece.DIARC, row - 1, col), (Piece.DIARC, row // 2 - 1, col - 1) ],
-                    [ (Piece.DIARC, row + 1, col), (Piece.DIARC, row // 2, col + 1) ],
-                ]
-
-            # angled bottom-left to top-right, left-side
-            elif row % 2 == 1 and col > 6:
-                check_locations = [
-                    [ (Piece.DIARC, row - 1, col), (Piece.DIARC, row // 2, col - 1) ],
-                    [ (Piece.DIARC, row + 1, col), (Piece.DIARC, row // 2, col + 1) ],
-                ]
-
-            # angled bottom-right to top-left: left-side
-            elif row % 2 == 0 and col > 6:
-                check_locations = [
-                    [ (Piece.DIARC, row - 1, col), (Piece.DIARC, row // 2 - 1, col + 1) ],
-                    [ (Piece.DIARC, row + 1, col), (Piece.DIARC, row // 2, col - 1) ],
-                ]
-
-            else:
-                check_locations = [ ]
-        # if
-
-        # check each of the locations
-        score = 0
-        for triangle_check in check_locations:
 
-            # add points if there is a score
-            if self._checkListofLocationsScores(triangle_check, player=move.player):
-                score += Game.POINT_TRIANGLE
-
-            # if
-        # for
-
-        return score
+        return self._checkPatternScore( move, Pattern.TRIANGLE )
 
     # checkScoreDiarcPiece_Triangle
 
-    def checkScoreTriarcPiece( self, move: Board.Move ):
+    def checkScoreTriarcPiece( self, move: Union[ Board.Move, int ] ):
         """ Function ot check if a Triarc placement is a scoring play
 
-            :param move: Board.Move of the move to be queried
+            :param move: Union[ Board.Move, int ] of the move to be queried
 
             :return: total score of a particular move
         """
-        score = 0
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
+            return 0
 
-        # add scores
-        score += self.checkScoreTriarcPiece_Diamond(move)   # TODO: diamond score check
-        score += self.checkScoreTriarcPiece_Gem(move)       # TODO: gem score check
-        score += self.checkScoreTriarcPiece_Pyramid(move)   # TODO: pyramid score check
-        score += self.checkScoreTriarcPiece_Hourglass(move) # TODO: hourglass score check
-        score += self.checkScoreTriarcPiece_Star(move)      # TODO: star score check
+        # if
 
-        return score
+        return self._checkPatternScore( move )
 
     # checkScoreTriarcPiece
 
-    def checkScoreTriarcPiece_Diamond( self, move: Board.Move ):
-        # TODO
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
-            return 0
+    def checkScoreTriarcPiece_Diamond( self, move: Union[ Board.Move, int ] ):
+        """ Check if any points are added from Diamond arrangement
+            after placing a Triarc
 
-        # if
-        
-        if move.piece is not Piece.TRIARC:
+        """
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
             return 0
 
         # if
-        
-        score = 0
-        return score
+
+        return self._checkPatternScore( move, Pattern.DIAMOND )
 
     # checkScoreTriarcPiece_Diamond
 
-    def checkScoreTriarcPiece_Gem( self, move: Board.Move ):
-        # TODO
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
-            return 0
+    def checkScoreTriarcPiece_Gem( self, move: Union[ Board.Move, int ] ):
+        """ Check if any points are added from Gem arrangement
+            after placing a Triarc
 
-        # if
-        
-        if move.piece is not Piece.TRIARC:
+        """
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
             return 0
 
         # if
-        
-        score = 0
-        return score
+
+        return self._checkPatternScore( move, Pattern.GEM )
 
     # checkScoreTriarcPiece_Gem
 
-    def checkScoreTriarcPiece_Hourglass( self, move: Board.Move ):
-        # TODO
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
-            return 0
+    def checkScoreTriarcPiece_Hourglass( self, move: Union[ Board.Move, int ] ):
+        """ Check if any points are added from Hourglass arrangement
+            after placing a Triarc
 
-        # if
-        
-        if move.piece is not Piece.TRIARC:
+        """
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
             return 0
 
         # if
-        
-        score = 0
-        return score
 
-    # checkScoreTriarcPiece_Gem
+        return self._checkPatternScore( move, Pattern.HOURGLASS )
 
-    def checkScoreTriarcPiece_Pyramid( self, move: Board.Move ):
-        # TODO
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
-            return 0
+    # checkScoreTriarcPiece_Hourglass
 
-        # if
-        
-        if move.piece is not Piece.TRIARC:
+    def checkScoreTriarcPiece_Pyramid( self, move: Union[ Board.Move, int ] ):
+        """ Check if any points are added from Pyramid arrangement
+            after placing a Triarc
+
+        """
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
             return 0
 
         # if
-        
-        score = 0
-        return score
+
+        return self._checkPatternScore( move, Pattern.PYRAMID )
 
     # checkScoreTriarcPiece_Pyramid
 
-    def checkScoreTriarcPiece_Star( self, move: Board.Move ):
-        # TODO
-        # check if it is a valid move
-        if not self.board.isValidMove( move ):
-            return 0
+    def checkScoreTriarcPiece_Star( self, move: Union[ Board.Move, int ] ):
+        """ Check if any points are added from Star arrangement
+            after placing a Triarc
 
-        # if
-        
-        if move.piece is not Piece.TRIARC:
+        """
+        if Board.getMovePiece( move ) is not Piece.TRIARC:
             return 0
 
         # if
-        
-        score = 0
-        return score
+
+        return self._checkPatternScore( move, Pattern.STAR )
 
     # checkScoreTriarcPiece_Star
 
-    def isValidMove( self, move: Board.Move ):
+    def legalMoves( self ) -> Iterator[ Board.Move ]:
+        """ Generate the valid moves of the player on deck (see Board.legalMoves) """
+        return self.board.legalMoves( self.playerOnDeck )
+
+    # legalMoves
+
+    def legalCells( self ) -> Iterator[ int ]:
+        """ Generate the valid moves of the player on deck as cell indices (see Board.legalCells) """
+        return self.board.legalCells( self.playerOnDeck )
+
+    # legalCells
+
+    def legalCodes( self ) -> Iterator[ int ]:
+        """ Generate the valid moves of the player on deck as encoded moves (see Board.legalCodes) """
+        return self.board.legalCodes( self.playerOnDeck )
+
+    # legalCodes
+
+    def isValidMove( self, move: Union[ Board.Move, int ] ):
         """ Check if move is valid"""
         # check board if move is valid
-        return self.board.isValidMove( move )
+        piece, location, player, _ = self._unpackMove( move )
+
+        return self.board.isValidPlacement( piece, location, player )
 
     # isValidMove
 
+    def make( self, move: Union[ Board.Move, int ] ):
+        """ Silently apply a move so that it can be taken back with unmake
+
+            :param move: Board.Move, or encoded move (see Board.encodeMove), of the move to be made
+
+            :return: the score update of the move, None if the move was not valid or was not
+                     the move of the player whose turn it is
+        """
+        piece, location, player, cell = self._unpackMove( move )
+        if player.number != self.turn:
+            return None
+
+        # if
+        if not self.board.placePiece( piece, location, player ):
+            return None
+
+        # if
+        score_update = self._updatePatternCounts( cell, player.number, 1 )
+
+        if player.number == 1:
+            self.player1Score += score_update
+
+        else:
+            self.player2Score += score_update
+
+        self._undoStack.append( (move, score_update, self.turn) )
+        self.updateTurn()
+
+        return score_update
+
+    # make
+
+    def scoreAllMoves( self, player: Player = None ):
+        """ Score every placement on the board in one batched computation
+
+            Equivalent to calling checkScore on all 144 placements: a placement scores the
+            points of each pattern instance containing it whose other cells are all owned
+            by the player.
+
+            :param player: (Optional) the player placing the pieces (default is the player on deck)
+
+            :returns: numpy array of the 144 cells' score updates (see Board.toArray), 0 for
+                      invalid moves
+        """
+        if player is None:
+            player = self.playerOnDeck
+
+        # if
+
+        cells = self.board.toArray()
+
+        # instances with all but one of their cells owned by the player
+        owned = PATTERN_TABLE.incidence @ (cells == player.number).astype( np.float32 )
+        completable = np.where( owned == PATTERN_TABLE.sizes - 1, PATTERN_TABLE.points, 0 )
+        scores = (PATTERN_TABLE.incidenceT @ completable).astype( np.int32 )
+
+        # only valid moves score
+        valid = cells == 0
+        if player.diarcs <= 0:
+            valid[ :Board.NUM_DIARCS ] = False
+
+        if player.triarcs <= 0:
+            valid[ Board.NUM_DIARCS: ] = False
+
+        return np.where( valid, scores, 0 )
+
+    # scoreAllMoves
+
     def play( self ):
         """ Plays the game
 
@@ -857,20 +1199,12 @@ class Game:
     def playPiece( self, location: int, piece: Piece ):
         """ Play a piece """
         move = Board.Move( location, piece, self.playerOnDeck )
-        score_update = self.checkScore( move )
-        success = self.board.playPiece( move )
+        score_update = self.make( move )
+        success = score_update is not None
 
         # piece was played
         if success:
-            if self.playerOnDeck.number == 1:
-                self.player1Score += score_update
-
-            else:
-                self.player2Score += score_update
-
-            print( f"Player: {self.playerOnDeck.number} | score update = {score_update}" )
-            # update the player turn
-            self.updateTurn()
+            print( f"Player: {move.player.number} | score update = {score_update}" )
 
         # if
 
@@ -884,6 +1218,188 @@ class Game:
 
     # updateTurn
 
+    def unmake( self ):
+        """ Take back the last move made, restoring the board, pieces, scores and turn
+
+            :return: the move that was taken back, as it was given to make, None if there are no
+                     moves to take back
+        """
+        if not self._undoStack:
+            return None
+
+        # if
+
+        move, score_update, turn = self._undoStack.pop()
+        piece, location, player, cell = self._unpackMove( move )
+        self.board.removePiece( piece, location, player )
+        self._updatePatternCounts( cell, player.number, -1 )
+
+        if player.number == 1:
+            self.player1Score -= score_update
+
+        else:
+            self.player2Score -= score_update
+
+        self.turn = turn
+
+        return move
+
+    # unmake
 
 
 # class: Game
+
+
+@dataclass
+class PatternInstance:
+    """ A single placement of a scoring pattern on the board
+
+        :param pattern: the Pattern this instance is of
+        :param points: the points scored for completing it
+        :param diarcs: the diarc locations making up the pattern
+        :param triarcs: the triarc locations making up the pattern
+        :param diarcMask: bitmask of the diarc locations
+        :param triarcMask: bitmask of the triarc locations
+    """
+    pattern: Pattern
+    points: int
+    diarcs: Tuple[ int, ... ]
+    triarcs: Tuple[ int, ... ]
+    diarcMask: int
+    triarcMask: int
+
+# dataclass: PatternInstance
+
+
+class PatternTable:
+    """ Precomputed index mapping each board location to the pattern instances it belongs to
+
+        The geometry of every pattern is walked once when the table is built, so scoring a
+        placement only looks up the instances of its location and tests their ownership.
+    """
+
+    def __init__( self, instances: List[ PatternInstance ] ):
+        self.instances = tuple( instances )
+
+        # location -> instances containing the location
+        diarcs = [ [ ] for _ in range( Board.NUM_DIARCS ) ]
+        triarcs = [ [ ] for _ in range( Board.NUM_TRIARCS ) ]
+        for instance in self.instances:
+            for location in instance.diarcs:
+                diarcs[ location ].append( instance )
+
+            for location in instance.triarcs:
+                triarcs[ location ].append( instance )
+
+        # for
+
+        self.diarcs = tuple( tuple( instances ) for instances in diarcs )
+        self.triarcs = tuple( tuple( instances ) for instances in triarcs )
+
+        # cell (see Board.getCell) -> indices of the instances containing the cell
+        indices = { id( instance ): i for i, instance in enumerate( self.instances ) }
+        self.cellInstances = tuple(
+                tuple( indices[ id( instance ) ] for instance in instances )
+                for instances in self.diarcs + self.triarcs
+        )
+        self.instanceSizes = tuple(
+                len( instance.diarcs ) + len( instance.triarcs ) for instance in self.instances )
+        self.instancePoints = tuple( instance.points for instance in self.instances )
+
+        # pattern-incidence matrix: instance x board cell (diarcs, then triarcs; see Board.toArray)
+        # stored as float32 so that products with it run through BLAS
+        self.incidence = np.zeros( (len( self.instances ), Board.NUM_PIECES), dtype=np.float32 )
+        for i, instance in enumerate( self.instances ):
+            self.incidence[ i, list( instance.diarcs ) ] = 1
+            self.incidence[ i, [ Board.NUM_DIARCS + location for location in instance.triarcs ] ] = 1
+
+        # for
+        self.incidenceT = np.ascontiguousarray( self.incidence.T )
+        self.sizes = self.incidence.sum( axis=1 )
+        self.points = np.array( [ instance.points for instance in self.instances ], dtype=np.float32 )
+
+    # __init__
+
+    @staticmethod
+    def _toIndex( piece: Piece, row: int, col: int ):
+        """ Convert a row-column to a list index, returning None if it is off of the board """
+        location = Board.rowColumnToIndex( piece, row, col )
+
+        return location if location != Board.OFF_BOARD else None
+
+    # _toIndex
+
+    @staticmethod
+    def _triarcEdges( row: int, col: int ):
+        """ Diarc (row, col)s of the three edges of the Triarc at (row, col)
+
+            The straight diarc columns 0, 2, ..., 12 lie on the 7 vertical lines of the board's
+            triangular lattice, and the angled diarc column between two of them runs between
+            those lines. The triarc columns run across the board the other way (see the board in
+            ui.py), so triarc column c lies between the lines of mirrored column m = 11 - c: its
+            base edge is a straight diarc and its two other edges are angled diarcs. Along the
+            pair of lines, the angled diarcs of a vertex of the shorter line are consecutive rows.
+
+            :returns: list of the (row, col) of the base edge, then of the two angled edges
+        """
+        mirrored = 11 - col
+        left = mirrored // 2  # line of straight diarc column 2 * left, left of the triarc
+        base = left + mirrored % 2
+        longer = left + 1 if left < 3 else left
+
+        # angled row of the edge from the base's first vertex to the apex
+        angled_row = 2 * row if base == longer else 2 * row + 1
+
+        return [
+            (row, 2 * base),
+            (angled_row, 2 * left + 1),
+            (angled_row + 1, 2 * left + 1),
+        ]
+
+    # _triarcEdges
+
+    @classmethod
+    def build( cls ):
+        """ Enumerate every pattern instance on the board and build the table
+
+            A Triangle is the three edges of a triarc and a Diamond is a diarc with the two
+            triarcs on either side of it, so diarcs on the edge of the board are in no Diamond.
+            The other patterns are not scored, so they have no instances.
+        """
+        instances = [ ]
+        bordering = [ [ ] for _ in range( Board.NUM_DIARCS ) ]  # diarc -> triarcs bordering it
+        for triarc in range( Board.NUM_TRIARCS ):
+            row, col = Board.getRowColumn( Piece.TRIARC, triarc )
+            diarcs = tuple( sorted(
+                    cls._toIndex( Piece.DIARC, r, c ) for r, c in cls._triarcEdges( row, col ) ) )
+            instances.append( PatternInstance(
+                    Pattern.TRIANGLE, Game.POINT_TRIANGLE, diarcs, (), sum( 1 << i for i in diarcs ), 0 ) )
+            for diarc in diarcs:
+                bordering[ diarc ].append( triarc )
+
+            # for
+        # for
+
+        for diarc, triarcs in enumerate( bordering ):
+            if len( triarcs ) == 2:
+                instances.append( PatternInstance(
+                        Pattern.DIAMOND,
+                        Game.POINT_DIAMOND,
+                        (diarc,),
+                        tuple( triarcs ),
+                        1 << diarc,
+                        sum( 1 << i for i in triarcs ),
+                ) )
+
+            # if
+        # for
+
+        return cls( instances )
+
+    # build
+
+
+# class: PatternTable
+
+# build the pattern-membership tables once at import
+PATTERN_TABLE = PatternTable.build()
@@ -1,9 +1,26 @@
+import argparse
+import time
+
 from game import Game
 from ui import GameApplication
 
 def main(args = None):
-    app = GameApplication()
-    app.run()
+    parser = argparse.ArgumentParser( description="Play Da Vinci's Challenge" )
+    parser.add_argument( "--fps", type=int, default=GameApplication.FPS, help="frame rate cap" )
+    parser.add_argument( "--vsync", action="store_true", help="sync frames with the display instead of capping" )
+    parser.add_argument( "--uncapped", action="store_true", help="run frames as fast as possible" )
+    parser.add_argument( "--frames", type=int, default=None, help="number of frames to run, then report the frame rate" )
+    args = parser.parse_args( args )
+
+    app = GameApplication( fps=None if args.uncapped else args.fps, vsync=args.vsync )
+
+    start = time.perf_counter()
+    frames = app.run( args.frames )
+    elapsed = time.perf_counter() - start
+    if args.frames is not None:
+        print( f"{frames} frames in {elapsed:.2f} s: {frames / elapsed:.1f} FPS" )
+
+    # if
 
 # main
 
@@ -0,0 +1,659 @@
+import math
+import multiprocessing
+import random
+import time
+
+from typing import (
+    List,
+    Tuple,
+)
+
+# package imports
+from game import Game, Board, PATTERN_TABLE
+
+
+class MonteCarloTreeSearch:
+    """ Monte Carlo Tree Search (UCT) engine
+
+        The search works on its own compact state: one 144-bit mask of owned locations per
+        player, where bit i is diarc i for i < 90 and triarc i - 90 otherwise. A pattern scores
+        for whoever owns all of its locations, so a playout only needs to hand the free
+        locations out to the players and score the final masks once. Handing them out as a
+        shuffle has the same outcome distribution as playing uniformly random moves.
+
+        With more than one worker the search runs across a process pool, either root-parallel
+        (each worker grows an independent tree and their root visit counts are merged) or
+        leaf-parallel (batches of leaves are selected with a virtual loss and their playouts
+        run in the workers). Workers are sent a snapshot tuple of ints, not the Game.
+    """
+    # parallel search modes
+    ROOT_PARALLEL = "root"
+    LEAF_PARALLEL = "leaf"
+
+    FULL_DIARCS = (1 << Board.NUM_DIARCS) - 1
+    FULL_CELLS = (1 << Board.NUM_PIECES) - 1
+
+    # (location mask, points) of each pattern instance
+    INSTANCES = [
+        (instance.diarcMask | instance.triarcMask << Board.NUM_DIARCS, instance.points)
+        for instance in PATTERN_TABLE.instances
+    ]
+
+    class Node:
+        """ Node of the search tree
+
+            :param cell: the location mask index of the move leading to this node
+            :param player: the number of the player that made the move
+            :param parent: the parent Node
+            :param untried: the cells of the moves that have not been expanded yet
+        """
+        __slots__ = ('cell', 'player', 'parent', 'children', 'untried', 'visits', 'wins')
+
+        def __init__( self, cell: int, player: int, parent, untried: List[ int ] ):
+            self.cell = cell
+            self.player = player
+            self.parent = parent
+            self.children = [ ]
+            self.untried = untried
+            self.visits = 0
+            self.wins = 0.0
+
+        # __init__
+
+    # class: Node
+
+    def __init__(
+            self,
+            maxPlayouts: int = None,
+            timeLimit: float = 1.0,
+            exploration: float = math.sqrt( 2 ),
+            seed: int = None,
+            workers: int = 1,
+            parallel: str = ROOT_PARALLEL,
+            leafBatch: int = 32,
+            leafPlayouts: int = 8,
+        ):
+        """ MonteCarloTreeSearch constructor
+
+            :param maxPlayouts: (Optional) number of playouts per move (None for no limit)
+            :param timeLimit: (Optional) seconds allowed per move (None for no time limit)
+            :param exploration: the UCT exploration constant
+            :param seed: (Optional) seed of the random number generator
+            :param workers: number of worker processes to search with (1 searches in-process).
+                            Must be 1 inside of a multiprocessing.Pool worker, e.g. in
+                            selfplay, as pool workers cannot start processes.
+            :param parallel: the parallel search mode, ROOT_PARALLEL or LEAF_PARALLEL
+            :param leafBatch: number of leaves selected per batch when leaf-parallel
+            :param leafPlayouts: number of playouts run per leaf when leaf-parallel
+
+        """
+        if (maxPlayouts is None) and (timeLimit is None):
+            raise ValueError( "One of maxPlayouts or timeLimit must be set!" )
+
+        # if
+
+        if workers < 1:
+            raise ValueError( "workers must be >= 1!" )
+
+        # if
+
+        if parallel not in [ self.ROOT_PARALLEL, self.LEAF_PARALLEL ]:
+            raise ValueError( f"parallel must be one of '{self.ROOT_PARALLEL}' or '{self.LEAF_PARALLEL}'!" )
+
+        # if
+
+        self.maxPlayouts = maxPlayouts
+        self.timeLimit = timeLimit
+        self.exploration = exploration
+        self.seed = seed
+        self.random = random.Random( seed )
+
+        self.workers = workers
+        self.parallel = parallel
+        self.leafBatch = leafBatch
+        self.leafPlayouts = leafPlayouts
+        self._pool = None
+
+        # statistics of the last search
+        self.playouts = 0
+        self.playoutsPerSecond = 0.0
+
+    # __init__
+
+    @staticmethod
+    def getCells( game: Game ):
+        """ Get the 144-bit location masks of each player in a game
+
+            :returns: list of masks indexed by player number (index 0 is unused)
+        """
+        cells = [ 0 ]
+        for number in (1, 2):
+            diarc_mask, triarc_mask = game.board.getMasks( number )
+            cells.append( diarc_mask | triarc_mask << Board.NUM_DIARCS )
+
+        # for
+
+        return cells
+
+    # getCells
+
+    @classmethod
+    def legalCells( cls, cells: List[ int ], diarcs: int, triarcs: int ):
+        """ Get the cells a player can play in
+
+            :param cells: the players' location masks
+            :param diarcs: the number of diarcs the player has left
+            :param triarcs: the number of triarcs the player has left
+
+            :returns: list of the free cells of the piece types the player has left
+        """
+        free = ~(cells[ 1 ] | cells[ 2 ]) & cls.FULL_CELLS
+        if diarcs <= 0:
+            free &= ~cls.FULL_DIARCS
+
+        if triarcs <= 0:
+            free &= cls.FULL_DIARCS
+
+        legal = [ ]
+        while free:
+            bit = free & -free
+            legal.append( bit.bit_length() - 1 )
+            free ^= bit
+
+        # while
+
+        return legal
+
+    # legalCells
+
+    @classmethod
+    def score( cls, cells: List[ int ] ):
+        """ Score a position from the players' location masks
+
+            :returns: (player 1 score, player 2 score)
+        """
+        cells1, cells2 = cells[ 1 ], cells[ 2 ]
+        score1 = score2 = 0
+        for mask, points in cls.INSTANCES:
+            if cells1 & mask == mask:
+                score1 += points
+
+            elif cells2 & mask == mask:
+                score2 += points
+
+        # for
+
+        return score1, score2
+
+    # score
+
+    def playout( self, cells: List[ int ], diarcs: List[ int ], triarcs: List[ int ] ):
+        """ Randomly play out a position to the end
+
+            :param cells: the players' location masks
+            :param diarcs: the number of diarcs each player has left
+            :param triarcs: the number of triarcs each player has left
+
+            :returns: (player 1 score, player 2 score) of the final position
+        """
+        free = ~(cells[ 1 ] | cells[ 2 ]) & self.FULL_CELLS
+        free_diarcs, free_triarcs = [ ], [ ]
+        while free:
+            bit = free & -free
+            (free_diarcs if bit <= self.FULL_DIARCS else free_triarcs).append( bit )
+            free ^= bit
+
+        # while
+
+        shuffle = self.random.shuffle
+        shuffle( free_diarcs )
+        shuffle( free_triarcs )
+
+        final = [
+            0,
+            cells[ 1 ] | sum( free_diarcs[ :diarcs[ 1 ] ] ) | sum( free_triarcs[ :triarcs[ 1 ] ] ),
+            cells[ 2 ]
+            | sum( free_diarcs[ diarcs[ 1 ]:diarcs[ 1 ] + diarcs[ 2 ] ] )
+            | sum( free_triarcs[ triarcs[ 1 ]:triarcs[ 1 ] + triarcs[ 2 ] ] ),
+        ]
+
+        return self.score( final )
+
+    # playout
+
+    def _select( self, node: Node ):
+        """ Select the child of a node with the highest upper confidence bound """
+        log_visits = math.log( node.visits )
+        exploration = self.exploration
+
+        return max(
+                node.children,
+                key=lambda child: (
+                        child.wins / child.visits
+                        + exploration * math.sqrt( log_visits / child.visits )
+                ) )
+
+    # _select
+
+    def _selectAndExpand(
+            self,
+            root: Node,
+            cells: List[ int ],
+            diarcs: List[ int ],
+            triarcs: List[ int ],
+            turn: int,
+        ):
+        """ Walk down the tree to a leaf, expanding it by one move
+
+            :param root: the root Node of the tree
+            :param cells: the players' location masks at the root
+            :param diarcs: the number of diarcs each player has left at the root
+            :param triarcs: the number of triarcs each player has left at the root
+            :param turn: the number of the player to move at the root
+
+            :returns: (leaf Node, location masks, diarcs left, triarcs left) at the leaf
+        """
+        node = root
+        cells, diarcs, triarcs = cells[ : ], diarcs[ : ], triarcs[ : ]
+
+        # selection
+        while (not node.untried) and node.children:
+            node = self._select( node )
+            self._apply( node.cell, node.player, cells, diarcs, triarcs )
+            turn = 3 - turn
+
+        # while
+
+        # expansion
+        if node.untried:
+            i = self.random.randrange( len( node.untried ) )
+            node.untried[ i ], node.untried[ -1 ] = node.untried[ -1 ], node.untried[ i ]
+            cell = node.untried.pop()
+
+            self._apply( cell, turn, cells, diarcs, triarcs )
+            child = MonteCarloTreeSearch.Node(
+                    cell,
+                    turn,
+                    node,
+                    self.legalCells( cells, diarcs[ 3 - turn ], triarcs[ 3 - turn ] ),
+            )
+            node.children.append( child )
+            node = child
+
+        # if
+
+        return node, cells, diarcs, triarcs
+
+    # _selectAndExpand
+
+    @staticmethod
+    def _backpropagate( node: Node, wins1: float, count: int ):
+        """ Add the results of playouts from a leaf to it and its ancestors
+
+            :param node: the leaf Node the playouts were run from
+            :param wins1: the number of playouts won by player 1 (draws count as half)
+            :param count: the number of playouts
+        """
+        while node is not None:
+            node.visits += count
+            node.wins += wins1 if node.player == 1 else count - wins1
+            node = node.parent
+
+        # while
+
+    # _backpropagate
+
+    @staticmethod
+    def _addVisits( node: Node, count: int ):
+        """ Add visits without any wins to a node and its ancestors """
+        while node is not None:
+            node.visits += count
+            node = node.parent
+
+        # while
+
+    # _addVisits
+
+    @staticmethod
+    def _result( score1: int, score2: int ):
+        """ Result of a playout for player 1: 1 for a win, 0.5 for a draw and 0 for a loss """
+        if score1 > score2:
+            return 1.0
+
+        elif score1 < score2:
+            return 0.0
+
+        return 0.5
+
+    # _result
+
+    def runPlayouts(
+            self,
+            root: Node,
+            cells: List[ int ],
+            diarcs: List[ int ],
+            triarcs: List[ int ],
+            turn: int,
+            maxPlayouts: int = None,
+            deadline: float = None,
+        ):
+        """ Grow a search tree with selection, expansion, playout and backpropagation
+
+            :param root: the root Node of the tree
+            :param cells: the players' location masks at the root
+            :param diarcs: the number of diarcs each player has left at the root
+            :param triarcs: the number of triarcs each player has left at the root
+            :param turn: the number of the player to move at the root
+            :param maxPlayouts: (Optional) the number of playouts to run
+            :param deadline: (Optional) time.perf_counter() time to stop at
+
+            :returns: the number of playouts run
+        """
+        playouts = 0
+        while (maxPlayouts is None) or (playouts < maxPlayouts):
+            if (deadline is not None) and (time.perf_counter() >= deadline):
+                break
+
+            # if
+
+            node, node_cells, node_diarcs, node_triarcs = self._selectAndExpand(
+                    root, cells, diarcs, triarcs, turn )
+            score1, score2 = self.playout( node_cells, node_diarcs, node_triarcs )
+            self._backpropagate( node, self._result( score1, score2 ), 1 )
+
+            playouts += 1
+
+        # while
+
+        return playouts
+
+    # runPlayouts
+
+    def _runLeafParallel(
+            self,
+            root: Node,
+            cells: List[ int ],
+            diarcs: List[ int ],
+            triarcs: List[ int ],
+            turn: int,
+            deadline: float = None,
+        ):
+        """ Grow a search tree running the playouts of batches of leaves in the process pool
+
+            A virtual loss (a visit without a win) is added along the path to each selected
+            leaf so that the leaves of a batch spread out over the tree.
+
+            :returns: the number of playouts run
+        """
+        pool = self._getPool()
+        playouts = 0
+        batch_index = 0
+        while (self.maxPlayouts is None) or (playouts < self.maxPlayouts):
+            if (deadline is not None) and (time.perf_counter() >= deadline):
+                break
+
+            # if
+
+            # select the leaves of the batch
+            leaves, snapshots = [ ], [ ]
+            for _ in range( self.leafBatch ):
+                node, node_cells, node_diarcs, node_triarcs = self._selectAndExpand(
+                        root, cells, diarcs, triarcs, turn )
+                self._addVisits( node, 1 )  # virtual loss
+
+                leaves.append( node )
+                snapshots.append(
+                        (node_cells[ 1 ], node_cells[ 2 ], node_diarcs[ 1 ], node_diarcs[ 2 ],
+                         node_triarcs[ 1 ], node_triarcs[ 2 ], 3 - node.player) )
+
+            # for
+
+            # run the playouts of the leaves across the workers
+            chunk = -(-len( snapshots ) // self.workers)
+            tasks = [
+                (snapshots[ i:i + chunk ], self.leafPlayouts, self._taskSeed( batch_index, i ))
+                for i in range( 0, len( snapshots ), chunk )
+            ]
+            wins = [ w for task_wins in pool.map( _leafParallelTask, tasks ) for w in task_wins ]
+            batch_index += 1
+
+            # replace the virtual losses with the playout results
+            for node, wins1 in zip( leaves, wins ):
+                self._addVisits( node, -1 )
+                self._backpropagate( node, wins1, self.leafPlayouts )
+
+            # for
+
+            playouts += len( leaves ) * self.leafPlayouts
+
+        # while
+
+        return playouts
+
+    # _runLeafParallel
+
+    @staticmethod
+    def _apply( cell: int, player: int, cells: List[ int ], diarcs: List[ int ], triarcs: List[ int ] ):
+        """ Play a cell for a player in place """
+        cells[ player ] |= 1 << cell
+        if cell < Board.NUM_DIARCS:
+            diarcs[ player ] -= 1
+
+        else:
+            triarcs[ player ] -= 1
+
+    # _apply
+
+    @staticmethod
+    def cellToMove( cell: int, player ) -> Board.Move:
+        """ Convert a cell index to a Board.Move for a player """
+        piece, location = Board.getPieceLocation( cell )
+
+        return Board.Move( location, piece, player )
+
+    # cellToMove
+
+    @classmethod
+    def getSnapshot( cls, game: Game ) -> Tuple[ int, ... ]:
+        """ Get the compact state of a game sent to the worker processes
+
+            :returns: (player 1 cells, player 2 cells, player 1 diarcs, player 2 diarcs,
+                       player 1 triarcs, player 2 triarcs, turn)
+        """
+        cells = cls.getCells( game )
+
+        return (
+            cells[ 1 ], cells[ 2 ],
+            game.player1.diarcs, game.player2.diarcs,
+            game.player1.triarcs, game.player2.triarcs,
+            game.turn,
+        )
+
+    # getSnapshot
+
+    @staticmethod
+    def _unpackSnapshot( snapshot: Tuple[ int, ... ] ):
+        """ Unpack a snapshot into (cells, diarcs, triarcs, turn) """
+        cells1, cells2, diarcs1, diarcs2, triarcs1, triarcs2, turn = snapshot
+
+        return [ 0, cells1, cells2 ], [ 0, diarcs1, diarcs2 ], [ 0, triarcs1, triarcs2 ], turn
+
+    # _unpackSnapshot
+
+    def _taskSeed( self, *offsets: int ):
+        """ Seed of a worker task, None if the search is not seeded """
+        if self.seed is None:
+            return None
+
+        return hash( (self.seed,) + offsets )
+
+    # _taskSeed
+
+    def _getPool( self ):
+        """ Get the worker process pool, starting it if needed """
+        if self._pool is None:
+            self._pool = multiprocessing.Pool( self.workers )
+
+        return self._pool
+
+    # _getPool
+
+    def close( self ):
+        """ Shut down the worker process pool """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+        # if
+
+    # close
+
+    def __enter__( self ):
+        return self
+
+    # __enter__
+
+    def __exit__( self, *args ):
+        self.close()
+
+    # __exit__
+
+    def searchSnapshot( self, snapshot: Tuple[ int, ... ], deadline: float = None ):
+        """ Grow a search tree from a snapshot
+
+            :param snapshot: the state to search from (see getSnapshot)
+            :param deadline: (Optional) time.perf_counter() time to stop at
+
+            :returns: (root Node of the tree, number of playouts run)
+        """
+        cells, diarcs, triarcs, turn = self._unpackSnapshot( snapshot )
+        root = MonteCarloTreeSearch.Node(
+                None, 3 - turn, None, self.legalCells( cells, diarcs[ turn ], triarcs[ turn ] ) )
+
+        playouts = 0
+        if root.untried:
+            if (self.workers > 1) and (self.parallel == self.LEAF_PARALLEL):
+                playouts = self._runLeafParallel( root, cells, diarcs, triarcs, turn, deadline )
+
+            else:
+                playouts = self.runPlayouts(
+                        root, cells, diarcs, triarcs, turn, self.maxPlayouts, deadline )
+
+        # if
+
+        return root, playouts
+
+    # searchSnapshot
+
+    def rootVisits( self, snapshot: Tuple[ int, ... ] ):
+        """ Search a snapshot and get the visit counts of its root moves
+
+            Root-parallel searches split the playout budget over the workers, each of which runs
+            this with a single process, and merge their visit counts.
+
+            :param snapshot: the state to search from (see getSnapshot)
+
+            :returns: ({cell: visits} of the root moves, number of playouts run)
+        """
+        start = time.perf_counter()
+        if (self.workers > 1) and (self.parallel == self.ROOT_PARALLEL):
+            max_playouts = (
+                -(-self.maxPlayouts // self.workers) if self.maxPlayouts is not None else None
+            )
+            tasks = [
+                (snapshot, max_playouts, self.timeLimit, self.exploration, self._taskSeed( i ))
+                for i in range( self.workers )
+            ]
+            visits, playouts = { }, 0
+            for worker_visits, worker_playouts in self._getPool().map( _rootParallelTask, tasks ):
+                for cell, cell_visits in worker_visits.items():
+                    visits[ cell ] = visits.get( cell, 0 ) + cell_visits
+
+                # for
+                playouts += worker_playouts
+
+            # for
+
+            return visits, playouts
+
+        # if
+
+        root, playouts = self.searchSnapshot(
+                snapshot, start + self.timeLimit if self.timeLimit is not None else None )
+        visits = { child.cell: child.visits for child in root.children }
+        if not visits and root.untried:
+            visits[ root.untried[ 0 ] ] = 0
+
+        # if
+
+        return visits, playouts
+
+    # rootVisits
+
+    def search( self, game: Game ) -> Board.Move:
+        """ Search for the best move of the player to move
+
+            :param game: the Game to search (it is not modified)
+
+            :returns: Board.Move of the most visited move, None if there are no valid moves
+        """
+        start = time.perf_counter()
+        visits, self.playouts = self.rootVisits( self.getSnapshot( game ) )
+        elapsed = time.perf_counter() - start
+        self.playoutsPerSecond = self.playouts / elapsed if elapsed > 0 else 0.0
+
+        if not visits:
+            return None
+
+        # if
+
+        best_cell = max( visits, key=visits.get )
+
+        return self.cellToMove( best_cell, game.playerOnDeck )
+
+    # search
+
+
+# class: MonteCarloTreeSearch
+
+
+def _rootParallelTask( args ):
+    """ Process pool task growing an independent tree from a snapshot
+
+        :param args: (snapshot, max playouts, time limit, exploration, seed)
+
+        :returns: ({cell: visits} of the root moves, number of playouts run)
+    """
+    snapshot, max_playouts, time_limit, exploration, seed = args
+    engine = MonteCarloTreeSearch(
+            maxPlayouts=max_playouts, timeLimit=time_limit, exploration=exploration, seed=seed )
+
+    return engine.rootVisits( snapshot )
+
+# _rootParallelTask
+
+
+def _leafParallelTask( args ):
+    """ Process pool task running the playouts of a chunk of leaves
+
+        :param args: (leaf snapshots, playouts per leaf, seed)
+
+        :returns: list of the number of playouts won by player 1 from each leaf
+    """
+    snapshots, playouts, seed = args
+    engine = MonteCarloTreeSearch( maxPlayouts=playouts, timeLimit=None, seed=seed )
+
+    wins = [ ]
+    for snapshot in snapshots:
+        cells, diarcs, triarcs, _ = engine._unpackSnapshot( snapshot )
+        wins.append(
+                sum(
+                        engine._result( *engine.playout( cells, diarcs, triarcs ) )
+                        for _ in range( playouts ) ) )
+
+    # for
+
+    return wins
+
+# _leafParallelTask
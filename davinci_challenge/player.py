@@ -1,4 +1,6 @@
 class Player:
+    __slots__ = ('number', 'diarcs', 'triarcs')
+
     def __init__( self, number: int, num_diarcs: int, num_triarcs: int ):
         """ Player constructor
 
@@ -26,13 +28,49 @@ class Player:
     def __repr__( self ):
         return f"Player{self.number}: diarcs={self.diarcs} | triarcs={self.triarcs}"
 
+    # __repr__
+
+    def copy( self ):
+        """ Copy the player and their pieces """
+        player = object.__new__( type( self ) )
+        player.number = self.number
+        player.diarcs = self.diarcs
+        player.triarcs = self.triarcs
+
+        return player
+
+    # copy
+
 
 # class: Player
 
 class AI( Player ):
-    def __init__( self, number: int, num_diarcs: int, num_triarcs: int ):
+    __slots__ = ('engine', 'book')
+
+    def __init__( self, number: int, num_diarcs: int, num_triarcs: int, engine=None, book=None ):
+        """ AI constructor
+
+            :param number: The player's number (must be 0 or 1)
+            :param num_diarcs: The number of diarcs the player starts with
+            :param num_triarcs: The number of triarcs the player starts with
+            :param engine: (Optional) search engine with a search(game) method returning
+                           a Board.Move (default is an AlphaBetaSearch)
+            :param book: (Optional) opening book with a lookup(game) method returning a
+                         Board.Move, or None out of book, consulted before searching (default
+                         is no book)
+
+        """
         super().__init__( number, num_diarcs, num_triarcs )
 
+        if engine is None:
+            from search import AlphaBetaSearch  # imported here to avoid a circular import with game
+            engine = AlphaBetaSearch()
+
+        # if
+
+        self.engine = engine
+        self.book = book
+
     # __init__
 
     def __repr__(self):
@@ -40,14 +78,37 @@ class AI( Player ):
 
     # __repr__
 
-    def playMove( self ):
+    def copy( self ):
+        """ Copy the AI and its pieces, sharing its engine and book """
+        player = super().copy()
+        player.engine = self.engine
+        player.book = self.book
+
+        return player
+
+    # copy
+
+    def playMove( self, game ):
         """ Plays the next player's move
 
+            :param game: the Game being played, with this AI as the player on deck
+
             :returns: Move object for the next move to play
         """
-        # TODO: AI implementation of move choice
-        raise NotImplementedError("AI not implemented yet.")
-        # return Board.Move( 0, Piece.DIARC, self )
+        if game.playerOnDeck is not self:
+            raise ValueError( "It is not this AI's turn to play!" )
+
+        # if
+
+        if self.book is not None:
+            move = self.book.lookup( game )
+            if move is not None:
+                return move
+
+            # if
+        # if
+
+        return self.engine.search( game )
 
     # playMove
 
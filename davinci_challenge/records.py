@@ -0,0 +1,187 @@
+import struct
+
+from dataclasses import dataclass
+from typing import (
+    BinaryIO,
+    Iterator,
+    List,
+    Tuple,
+)
+
+# package imports
+from game import Game, Board, Piece
+from bitboard import BitBoard
+
+# file header: magic bytes and format version
+MAGIC = b"DVGR"
+VERSION = 1
+FILE_HEADER = struct.Struct( "<4sB" )
+
+# record header: number of moves, final player 1 score, final player 2 score
+RECORD_HEADER = struct.Struct( "<Bhh" )
+
+
+@dataclass
+class GameRecord:
+    """ Record of a played game
+
+        :param cells: the cell index (see Board.getCell) of each move in order, one byte each.
+                      Players alternate starting with player 1.
+        :param player1Score: the final score of player 1
+        :param player2Score: the final score of player 2
+    """
+    cells: bytes
+    player1Score: int
+    player2Score: int
+
+    @classmethod
+    def fromGame( cls, game: Game ):
+        """ Record the moves made in a game so far """
+        return cls(
+                bytes( Board.getCell( move.piece, move.location ) for move in game.history ),
+                game.player1Score,
+                game.player2Score,
+        )
+
+    # fromGame
+
+    def toBytes( self ):
+        """ Encode the record in the binary record format """
+        return RECORD_HEADER.pack( len( self.cells ), self.player1Score, self.player2Score ) + self.cells
+
+    # toBytes
+
+    @property
+    def moves( self ) -> List[ Tuple[ Piece, int ] ]:
+        """ The (Piece, location) of each move in order """
+        return [ Board.getPieceLocation( cell ) for cell in self.cells ]
+
+    # property: moves
+
+    def replay( self, game: Game = None ) -> Iterator[ Tuple[ Game, Board.Move ] ]:
+        """ Replay the record's moves into a game
+
+            :param game: (Optional) a new Game to replay into (default is a new Game on a BitBoard)
+
+            :returns: generator of (game, move) after each move is made
+        """
+        if game is None:
+            game = Game( BitBoard() )
+
+        # if
+
+        for piece, location in self.moves:
+            move = Board.Move( location, piece, game.playerOnDeck )
+            if game.make( move ) is None:
+                raise ValueError( f"Invalid move in record: {move}" )
+
+            # if
+
+            yield game, move
+
+        # for
+
+    # replay
+
+
+# dataclass: GameRecord
+
+
+class GameRecordWriter:
+    """ Append-only writer of game records to a binary record file """
+
+    def __init__( self, path: str ):
+        """ GameRecordWriter constructor
+
+            :param path: path of the record file, which is created if it does not exist
+
+        """
+        self.file = open( path, "ab" )
+        if self.file.tell() == 0:
+            self.file.write( FILE_HEADER.pack( MAGIC, VERSION ) )
+
+        # if
+
+    # __init__
+
+    def __enter__( self ):
+        return self
+
+    # __enter__
+
+    def __exit__( self, *args ):
+        self.close()
+
+    # __exit__
+
+    def close( self ):
+        """ Close the record file """
+        self.file.close()
+
+    # close
+
+    def write( self, game: Game ):
+        """ Write the record of a game """
+        self.writeRecord( GameRecord.fromGame( game ) )
+
+    # write
+
+    def writeRecord( self, record: GameRecord ):
+        """ Write a game record """
+        self.file.write( record.toBytes() )
+
+    # writeRecord
+
+
+# class: GameRecordWriter
+
+
+def readRecords( source ) -> Iterator[ GameRecord ]:
+    """ Stream the game records of a record file, one record at a time
+
+        :param source: path of the record file or a binary file object opened on it
+
+        :returns: generator of the GameRecords in the file
+    """
+    if isinstance( source, str ):
+        with open( source, "rb" ) as record_file:
+            yield from readRecords( record_file )
+
+        return
+
+    # if
+
+    record_file: BinaryIO = source
+    magic, version = FILE_HEADER.unpack( record_file.read( FILE_HEADER.size ) )
+    if magic != MAGIC:
+        raise ValueError( "Not a game record file!" )
+
+    # if
+    if version != VERSION:
+        raise ValueError( f"Unsupported game record version: {version}" )
+
+    # if
+
+    while True:
+        header = record_file.read( RECORD_HEADER.size )
+        if not header:
+            break
+
+        # if
+        if len( header ) < RECORD_HEADER.size:
+            raise ValueError( "Truncated game record file!" )
+
+        # if
+
+        num_moves, player1_score, player2_score = RECORD_HEADER.unpack( header )
+        cells = record_file.read( num_moves )
+        if len( cells ) < num_moves:
+            raise ValueError( "Truncated game record file!" )
+
+        # if
+
+        yield GameRecord( cells, player1_score, player2_score )
+
+    # while
+
+# readRecords
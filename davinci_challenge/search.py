@@ -0,0 +1,318 @@
+import random
+import time
+
+from typing import (
+    List,
+    Tuple,
+)
+
+# package imports
+from game import Game, Board
+from transposition import TranspositionTable
+from symmetry import canonicalKey, inverseMove, transformMove
+
+
+class SearchTimeout( Exception ):
+    """ Raised inside of a search when its time or node budget has run out """
+    pass
+
+
+# class: SearchTimeout
+
+
+class AlphaBetaSearch:
+    """ Negamax search with alpha-beta pruning and iterative deepening
+
+        Positions are evaluated as the score difference for the player to move. The search
+        deepens one ply at a time until the depth limit, or until the time or node budget runs
+        out, and returns the best move of the last completed depth. Searched positions are
+        cached in a TranspositionTable keyed by the board's Zobrist hash, or optionally by the
+        hash of its canonical form so that symmetric positions share their entries.
+    """
+    def __init__(
+            self,
+            maxDepth: int = 8,
+            timeLimit: float = 0.2,
+            maxNodes: int = None,
+            table: TranspositionTable = None,
+            canonical: bool = False,
+        ):
+        """ AlphaBetaSearch constructor
+
+            :param maxDepth: the deepest number of plies to search
+            :param timeLimit: (Optional) seconds allowed per move (None for no time limit)
+            :param maxNodes: (Optional) number of nodes allowed per move (None for no limit)
+            :param table: (Optional) the TranspositionTable to cache positions in
+                          (default is a new TranspositionTable)
+            :param canonical: (Optional) key the table by the positions' canonical form (see
+                              symmetry.canonicalKey), storing moves in its orientation
+                              (default is False)
+
+        """
+        if maxDepth < 1:
+            raise ValueError( "maxDepth must be >= 1!" )
+
+        # if
+
+        self.maxDepth = maxDepth
+        self.timeLimit = timeLimit
+        self.maxNodes = maxNodes
+        self.table = table if table is not None else TranspositionTable()
+        self.canonical = canonical
+
+        # statistics of the last search
+        self.nodes = 0
+        self.depthReached = 0
+        self.bestScore = 0
+
+        self._deadline = None
+
+    # __init__
+
+    @staticmethod
+    def evaluate( game: Game ):
+        """ Evaluate the position for the player to move """
+        if game.turn == 1:
+            return game.player1Score - game.player2Score
+
+        return game.player2Score - game.player1Score
+
+    # evaluate
+
+    def _checkBudget( self ):
+        """ Raise a SearchTimeout if the time or node budget has run out """
+        if (self.maxNodes is not None) and (self.nodes >= self.maxNodes):
+            raise SearchTimeout()
+
+        # if
+        if (self._deadline is not None) and (time.perf_counter() >= self._deadline):
+            raise SearchTimeout()
+
+        # if
+
+    # _checkBudget
+
+    @staticmethod
+    def orderedMoves( game: Game ) -> List[ Tuple[ int, int ] ]:
+        """ Get the valid moves for the player to move ordered by their score update
+
+            :param game: the Game to generate the moves of
+
+            :returns: list of (encoded move (see Board.encodeMove), score update) sorted from best
+                      to worst
+        """
+        moves = [ (move, game.checkScore( move )) for move in game.legalCodes() ]
+        moves.sort( key=lambda move_score: move_score[ 1 ], reverse=True )
+
+        return moves
+
+    # orderedMoves
+
+    def _negamax( self, game: Game, depth: int, alpha: float, beta: float ):
+        """ Negamax value of the position for the player to move """
+        self.nodes += 1
+        self._checkBudget()
+
+        if (depth == 0) or game.board.isFilled():
+            return self.evaluate( game )
+
+        # if
+
+        # look up the position in the transposition table
+        if self.canonical:
+            key, symmetry = canonicalKey( game.board )
+
+        else:
+            key, symmetry = game.board.key, 0
+
+        # else
+        alpha_original = alpha
+        table_move = TranspositionTable.NO_MOVE
+        entry = self.table.probe( key )
+        if entry is not None:
+            entry_depth, entry_score, bound, table_move = entry
+            if symmetry and (table_move != TranspositionTable.NO_MOVE):
+                table_move = inverseMove( table_move, symmetry )
+
+            # if
+            if entry_depth >= depth:
+                if bound == TranspositionTable.EXACT:
+                    return entry_score
+
+                elif bound == TranspositionTable.LOWER:
+                    alpha = max( alpha, entry_score )
+
+                elif bound == TranspositionTable.UPPER:
+                    beta = min( beta, entry_score )
+
+                if alpha >= beta:
+                    return entry_score
+
+                # if
+            # if
+        # if
+
+        moves = self.orderedMoves( game )
+
+        # search the table's best move first
+        if table_move != TranspositionTable.NO_MOVE:
+            for i, (move, _) in enumerate( moves ):
+                if move == table_move:
+                    moves.insert( 0, moves.pop( i ) )
+                    break
+
+                # if
+            # for
+        # if
+
+        best_value = -float( "inf" )
+        best_move = None
+        for move, _ in moves:
+            game.make( move )
+            try:
+                value = -self._negamax( game, depth - 1, -beta, -alpha )
+
+            finally:
+                game.unmake()
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+
+            # if
+            if value > alpha:
+                alpha = value
+
+            # if
+            if alpha >= beta:
+                break
+
+            # if
+        # for
+
+        # cache the result
+        if best_value <= alpha_original:
+            bound = TranspositionTable.UPPER
+
+        elif best_value >= beta:
+            bound = TranspositionTable.LOWER
+
+        else:
+            bound = TranspositionTable.EXACT
+
+        if symmetry and (best_move is not None):
+            best_move = transformMove( best_move, symmetry )
+
+        # if
+        self.table.store( key, depth, best_value, bound, best_move )
+
+        return best_value
+
+    # _negamax
+
+    def _searchRoot( self, game: Game, moves: List[ int ], depth: int ):
+        """ Search the root moves to a depth
+
+            :param moves: the encoded moves (see Board.encodeMove) to search
+
+            :returns: (best encoded move, its value)
+        """
+        alpha, beta = -float( "inf" ), float( "inf" )
+        best_move = moves[ 0 ]
+        for move in moves:
+            game.make( move )
+            try:
+                value = -self._negamax( game, depth - 1, -beta, -alpha )
+
+            finally:
+                game.unmake()
+
+            if value > alpha:
+                alpha = value
+                best_move = move
+
+            # if
+        # for
+
+        return best_move, alpha
+
+    # _searchRoot
+
+    def search( self, game: Game ) -> Board.Move:
+        """ Search for the best move of the player to move
+
+            The game is returned to its original state once the search is over.
+
+            :param game: the Game to search
+
+            :returns: Board.Move of the best move found, None if there are no valid moves
+        """
+        self.nodes = 0
+        self.depthReached = 0
+        self._deadline = (
+            time.perf_counter() + self.timeLimit if self.timeLimit is not None else None
+        )
+
+        moves = [ move for move, _ in self.orderedMoves( game ) ]
+        if not moves:
+            return None
+
+        # if
+
+        # fall back on the greedy move if not even the first depth completes
+        best_move = moves[ 0 ]
+        self.bestScore = self.evaluate( game )
+        for depth in range( 1, self.maxDepth + 1 ):
+            try:
+                move, value = self._searchRoot( game, moves, depth )
+
+            except SearchTimeout:
+                break
+
+            # try
+
+            best_move, self.bestScore = move, value
+            self.depthReached = depth
+
+            # search the best move first at the next depth
+            moves.remove( move )
+            moves.insert( 0, move )
+
+        # for
+
+        return game.decodeMove( best_move )
+
+    # search
+
+
+# class: AlphaBetaSearch
+
+
+class RandomSearch:
+    """ Baseline engine playing a uniformly random valid move """
+
+    def __init__( self, seed: int = None ):
+        """ RandomSearch constructor
+
+            :param seed: (Optional) seed of the random number generator
+
+        """
+        self.random = random.Random( seed )
+
+    # __init__
+
+    def search( self, game: Game ) -> Board.Move:
+        """ Pick a random valid move of the player to move
+
+            :param game: the Game to pick a move in
+
+            :returns: Board.Move of the chosen move, None if there are no valid moves
+        """
+        moves = list( game.legalMoves() )
+
+        return self.random.choice( moves ) if moves else None
+
+    # search
+
+
+# class: RandomSearch
@@ -0,0 +1,327 @@
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import time
+
+from typing import (
+    Dict,
+    List,
+)
+
+# package imports
+from game import Game
+from bitboard import BitBoard
+from player import AI
+from search import AlphaBetaSearch, RandomSearch
+from mcts import MonteCarloTreeSearch
+from records import GameRecord, GameRecordWriter
+
+# name -> engine class of the strategies that can be played
+STRATEGIES = {
+    "alphabeta": AlphaBetaSearch,
+    "mcts"     : MonteCarloTreeSearch,
+    "random"   : RandomSearch,
+}
+
+
+def parseStrategy( strategy: str ):
+    """ Parse a strategy into its name and engine keyword arguments
+
+        :param strategy: the strategy's name with optional engine keyword arguments, e.g.
+                         "alphabeta" or "mcts:timeLimit=0.05,exploration=1.0"
+
+        :returns: (strategy name, dict of the engine keyword arguments)
+    """
+    name, _, options = strategy.partition( ":" )
+    if name not in STRATEGIES:
+        raise ValueError( f"Unknown strategy '{name}'. Must be one of {list( STRATEGIES )}!" )
+
+    # if
+
+    kwargs = dict()
+    for option in filter( None, options.split( "," ) ):
+        key, _, value = option.partition( "=" )
+        kwargs[ key.strip() ] = ast.literal_eval( value.strip() )
+
+    # for
+
+    return name, kwargs
+
+# parseStrategy
+
+
+def makeEngine( strategy: str, seed: int = None ):
+    """ Build the engine of a strategy
+
+        :param strategy: the strategy's name with optional engine keyword arguments (see
+                         parseStrategy)
+        :param seed: (Optional) seed for engines taking one
+
+        :returns: the strategy's engine
+    """
+    name, kwargs = parseStrategy( strategy )
+    if (seed is not None) and (name != "alphabeta"):
+        kwargs.setdefault( "seed", seed )
+
+    # if
+
+    return STRATEGIES[ name ]( **kwargs )
+
+# makeEngine
+
+
+def playGame( strategy1: str, strategy2: str, seed: int = None ):
+    """ Play a game between two strategies to the end
+
+        :param strategy1: the strategy of player 1 (see makeEngine)
+        :param strategy2: the strategy of player 2 (see makeEngine)
+        :param seed: (Optional) seed of the game's engines
+
+        :returns: (dict of the game's result, GameRecord of the game)
+    """
+    player1 = AI( 1, Game.START_DIARCS, Game.START_TRIARCS, makeEngine( strategy1, seed ) )
+    player2 = AI(
+            2, Game.START_DIARCS, Game.START_TRIARCS,
+            makeEngine( strategy2, None if seed is None else seed + 1 ) )
+    game = Game( BitBoard(), player1, player2 )
+
+    move_times = { 1: [ ], 2: [ ] }
+    while not game.board.isFilled():
+        player = game.playerOnDeck
+
+        start = time.perf_counter()
+        move = player.playMove( game )
+        move_times[ player.number ].append( time.perf_counter() - start )
+
+        if (move is None) or (game.make( move ) is None):
+            raise RuntimeError( f"{strategy1 if player.number == 1 else strategy2} played an invalid move!" )
+
+        # if
+    # while
+
+    if game.player1Score > game.player2Score:
+        winner = 1
+
+    elif game.player1Score < game.player2Score:
+        winner = 2
+
+    else:
+        winner = 0
+
+    result = {
+        "player1"       : strategy1,
+        "player2"       : strategy2,
+        "winner"        : winner,
+        "player1Score"  : game.player1Score,
+        "player2Score"  : game.player2Score,
+        "plies"         : sum( len( times ) for times in move_times.values() ),
+        "player1MoveTime": sum( move_times[ 1 ] ) / max( 1, len( move_times[ 1 ] ) ),
+        "player2MoveTime": sum( move_times[ 2 ] ) / max( 1, len( move_times[ 2 ] ) ),
+        "seed"          : seed,
+    }
+
+    return result, GameRecord.fromGame( game )
+
+# playGame
+
+
+def _playGameTask( args ):
+    """ Process pool task playing a single game """
+    index, strategy1, strategy2, seed, player1_side = args
+    result, record = playGame( strategy1, strategy2, seed )
+    result[ "game" ] = index
+    result[ "player1Side" ] = player1_side
+
+    return result, record
+
+# _playGameTask
+
+
+def wilsonInterval( successes: float, trials: int, z: float = 1.96 ):
+    """ Wilson score confidence interval of a proportion
+
+        :param successes: the number of successes (may be fractional, e.g. for draws)
+        :param trials: the number of trials
+        :param z: the standard score of the confidence level (1.96 for 95%)
+
+        :returns: (lower, upper) bounds of the interval
+    """
+    if trials == 0:
+        return 0.0, 1.0
+
+    # if
+
+    p = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (p + z ** 2 / (2 * trials)) / denominator
+    margin = z * math.sqrt( p * (1 - p) / trials + z ** 2 / (4 * trials ** 2) ) / denominator
+
+    return max( 0.0, center - margin ), min( 1.0, center + margin )
+
+# wilsonInterval
+
+
+def aggregate( results: List[ Dict ] ):
+    """ Aggregate game results into win rates for each side of the match
+
+        Results are aggregated by side rather than by strategy, so that the sides of a match
+        between identical strategies are not merged. Results without the side of player 1 (see
+        selfplay) count player 1 as side 1. Draws count as half of a win.
+
+        :param results: list of the game results (see playGame)
+
+        :returns: dict of side (1 or 2) -> summary of its games, including its strategy
+    """
+    summary = dict()
+    for result in results:
+        player1_side = result.get( "player1Side", 1 )
+        for number in (1, 2):
+            side = player1_side if number == 1 else 3 - player1_side
+            stats = summary.setdefault( side, {
+                "strategy": result[ f"player{number}" ],
+                "games"   : 0,
+                "wins"    : 0,
+                "draws"   : 0,
+                "losses"  : 0,
+                "moveTime": 0.0,
+            } )
+            stats[ "games" ] += 1
+            stats[ "moveTime" ] += result[ f"player{number}MoveTime" ]
+            if result[ "winner" ] == number:
+                stats[ "wins" ] += 1
+
+            elif result[ "winner" ] == 0:
+                stats[ "draws" ] += 1
+
+            else:
+                stats[ "losses" ] += 1
+
+        # for
+    # for
+
+    for stats in summary.values():
+        points = stats[ "wins" ] + 0.5 * stats[ "draws" ]
+        stats[ "winRate" ] = points / stats[ "games" ]
+        stats[ "winRate95" ] = wilsonInterval( points, stats[ "games" ] )
+        stats[ "moveTime" ] /= stats[ "games" ]
+
+    # for
+
+    return summary
+
+# aggregate
+
+
+def readResults( path: str ):
+    """ Read the game results streamed to a results file """
+    with open( path, "r" ) as results_file:
+        return [ json.loads( line ) for line in results_file if line.strip() ]
+
+# readResults
+
+
+def selfplay(
+        strategy1: str,
+        strategy2: str,
+        games: int,
+        output: str,
+        workers: int = None,
+        seed: int = 0,
+        records: str = None,
+    ):
+    """ Play games between two strategies across a process pool
+
+        The strategies alternate playing first, and each game's result records which of them
+        played player 1 as its "player1Side" (1 for strategy1, 2 for strategy2). Each result is
+        appended to the output file as a line of JSON as soon as its game finishes.
+
+        The games already run in pool worker processes, which cannot start processes of their
+        own, so strategies searching with more than one worker process (e.g. "mcts:workers=4")
+        are rejected.
+
+        :param strategy1: the first strategy (see makeEngine)
+        :param strategy2: the second strategy (see makeEngine)
+        :param games: the number of games to play
+        :param output: path of the results file to append to
+        :param workers: (Optional) number of worker processes (default is the number of CPUs)
+        :param seed: the seed of the first game, incremented for each game
+        :param records: (Optional) path of a game record file to append the games' moves to
+
+        :returns: list of the game results
+    """
+    for strategy in (strategy1, strategy2):
+        if parseStrategy( strategy )[ 1 ].get( "workers", 1 ) > 1:
+            raise ValueError(
+                    f"Strategy '{strategy}' cannot search with more than 1 worker in self-play games, "
+                    "which already run in worker processes!" )
+
+        # if
+    # for
+
+    tasks = [
+        (i, strategy1, strategy2, seed + 2 * i, 1) if i % 2 == 0 else
+        (i, strategy2, strategy1, seed + 2 * i, 2)
+        for i in range( games )
+    ]
+
+    results = [ ]
+    record_writer = GameRecordWriter( records ) if records is not None else None
+    try:
+        with multiprocessing.Pool( workers ) as pool, open( output, "a" ) as results_file:
+            for result, record in pool.imap_unordered( _playGameTask, tasks ):
+                results_file.write( json.dumps( result ) + "\n" )
+                results_file.flush()
+                results.append( result )
+
+                if record_writer is not None:
+                    record_writer.writeRecord( record )
+
+                # if
+            # for
+        # with
+
+    finally:
+        if record_writer is not None:
+            record_writer.close()
+
+        # if
+    # try
+
+    return results
+
+# selfplay
+
+
+def main( args=None ):
+    parser = argparse.ArgumentParser( description="Play headless games between AI strategies" )
+    parser.add_argument( "strategy1", type=str, help=f"strategy, one of {list( STRATEGIES )}" )
+    parser.add_argument( "strategy2", type=str, help=f"strategy, one of {list( STRATEGIES )}" )
+    parser.add_argument( "--games", type=int, default=100, help="number of games to play" )
+    parser.add_argument( "--workers", type=int, default=None, help="number of worker processes" )
+    parser.add_argument( "--output", type=str, default="selfplay.jsonl", help="results file to append to" )
+    parser.add_argument( "--seed", type=int, default=0, help="seed of the first game" )
+    parser.add_argument( "--records", type=str, default=None, help="game record file to append to" )
+    args = parser.parse_args( args )
+
+    results = selfplay(
+            args.strategy1, args.strategy2, args.games, args.output, args.workers, args.seed,
+            args.records )
+
+    for side, stats in sorted( aggregate( results ).items() ):
+        lower, upper = stats[ "winRate95" ]
+        print(
+                f"strategy{side} {stats[ 'strategy' ]}: {stats[ 'wins' ]}W {stats[ 'draws' ]}D {stats[ 'losses' ]}L | "
+                f"win rate = {stats[ 'winRate' ]:.3f} (95% CI {lower:.3f}-{upper:.3f}) | "
+                f"move time = {1000 * stats[ 'moveTime' ]:.1f} ms" )
+
+    # for
+
+# main
+
+
+if __name__ == "__main__":
+    main()
+
+# if __main__
@@ -1 +1,4 @@
-from .sprite_pieces import SpritePiece, SpriteDiarc, SpriteTriarc
\ No newline at end of file
+from .sprite_pieces import SpritePiece, SpriteDiarc, SpriteTriarc, VARIANTS
+from .sprite_assets import AssetManager, ASSETS
+from .sprite_text import SpriteText
+from .sprite_variants import SpriteVariants
\ No newline at end of file
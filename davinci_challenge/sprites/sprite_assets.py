@@ -0,0 +1,95 @@
+import os
+
+from typing import Dict, Tuple
+
+import pygame as pg
+
+# the assets directory next to the package, independent of the working directory
+PACKAGE_DIR = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+ASSETS_DIR = os.path.join( os.path.dirname( PACKAGE_DIR ), 'assets' )
+
+
+class AssetManager:
+    """ Loads each image asset once and shares it between everything drawing it
+
+        Images are converted to the display's pixel format as soon as there is a display, so
+        blitting them needs no conversion. The shared images must not be drawn on; recolor them
+        with recolored, which works on a copy.
+    """
+
+    def __init__( self, directory: str = ASSETS_DIR ):
+        """ AssetManager constructor
+
+            :param directory: (Optional) the directory of the assets (default is ASSETS_DIR)
+
+        """
+        self.directory = directory
+
+        self._images = dict()  # (name, scale) -> image
+        self._converted = set()  # keys of the images converted to the display's pixel format
+
+    # __init__
+
+    def getPath( self, name: str ):
+        """ Get the path of an asset from its name """
+        return os.path.join( self.directory, name )
+
+    # getPath
+
+    def getImage( self, name: str, scale: int = 1 ) -> pg.Surface:
+        """ Get the shared image of an asset, loading it on first use
+
+            :param name: the asset's file name, e.g. 'diarc.png'
+            :param scale: (Optional) the factor to scale the image by (default is 1)
+
+            :returns: the shared image, which must not be drawn on
+        """
+        key = (name, scale)
+        image = self._images.get( key )
+        if image is None:
+            image = pg.image.load( self.getPath( name ) )
+            if scale != 1:
+                image = pg.transform.scale( image, (scale * image.get_width(), scale * image.get_height()) )
+
+            # if
+            self._images[ key ] = image
+
+        # if
+
+        if (key not in self._converted) and (pg.display.get_surface() is not None):
+            image = self._images[ key ] = image.convert_alpha()
+            self._converted.add( key )
+
+        # if
+
+        return image
+
+    # getImage
+
+
+# class: AssetManager
+
+
+def recolored( image: pg.Surface, replacements: Dict[ Tuple[ int, int, int ], Tuple[ int, int, int ] ] ):
+    """ Recolor a copy of an image, leaving the (possibly shared) image untouched
+
+        :param image: the image to recolor
+        :param replacements: dict of old color -> new color, applied in order
+
+        :returns: the recolored copy
+    """
+    image = image.copy()
+    px_array = pg.PixelArray( image )
+    for old_color, new_color in replacements.items():
+        px_array.replace( old_color, new_color )
+
+    # for
+    px_array.close()
+
+    return image
+
+# recolored
+
+
+# the images shared by all of the sprites
+ASSETS = AssetManager()
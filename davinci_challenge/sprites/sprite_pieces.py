@@ -1,9 +1,12 @@
 import pygame as pg
 import game
 
+from .sprite_assets import ASSETS
+from .sprite_variants import SpriteVariants
+
 
 # TODO: sprites for multicolor Diarcs and Triarcs
-class SpritePiece( pg.sprite.Sprite ):
+class SpritePiece( pg.sprite.DirtySprite ):
     COLOR_EMPTY = (0, 0, 0)
     COLOR_PLAYER1 = (0, 0, 255)
     COLOR_PLAYER2 = (255, 0, 0)
@@ -12,42 +15,29 @@ class SpritePiece( pg.sprite.Sprite ):
         super().__init__()
 
         self.image = pg.Surface( (100, 100) )
+        self.rect = self.image.get_rect( topleft=(x, y) )
         self.player = None
         self.x, self.y = x, y
         self.hovered = False
+        self.rotation = 0
         self.pieceType = None
 
     # __init__
 
-    @property
-    def rect( self ) -> pg.Rect:
-        r = self.image.get_rect()
-        r.x += self.x
-        r.y += self.y
-        return r
-
-    # property: rect
-
     def blit( self, screen: pg.Surface, *args ):
         """ Render the Sprite"""
-        if self.hovered:
-            px_array = pg.PixelArray( self.image.copy() )
-            if self.player is None:
-                old_color = self.COLOR_EMPTY
-            elif self.player == 1:
-                old_color = self.COLOR_PLAYER1
-            else:
-                old_color = self.COLOR_PLAYER2
-            new_color = tuple( min( 255, c + 50 ) for c in old_color )
-            px_array.replace( old_color, new_color )
-            image = px_array.surface.copy()
-        else:
-            image = self.image
-
-        screen.blit( image, (self.x, self.y), *args )
+        screen.blit( self.image, (self.x, self.y), *args )
 
     # blit
 
+    def _updateImage( self ):
+        """ Pick the displayed image of the piece's current variant, marking it for redraw """
+        self.image = VARIANTS.getImage( self.pieceType, self.rotation, self.player, self.hovered )
+        self.rect = self.image.get_rect( topleft=(self.x, self.y) )
+        self.dirty = 1
+
+    # _updateImage
+
     def distanceFromCenter( self, x, y ):
         xc, yc = self.rect.center
         return (x - xc) ** 2 + (y - yc) ** 2
@@ -57,46 +47,63 @@ class SpritePiece( pg.sprite.Sprite ):
     def update(
             self, player: int = None, x: int = None, y: int = None, rotation: float = None,
             hovered: bool = False ):
+        changed = False
+
         # update player
         if (self.player is None) and (player in [ 1, 2 ]):
             self.player = player  # set the owner of the player
-            color = self.COLOR_PLAYER1 if player == 1 else self.COLOR_PLAYER2
-
-            px_array = pg.PixelArray( self.image )
-            px_array.replace( self.COLOR_EMPTY, color )
-            self.image = px_array.surface.copy()
-            self.image.unlock()
+            changed = True
 
         # if
 
         # update location
         if x is not None:
             self.x = x
+            changed = True
 
         if y is not None:
             self.y = y
+            changed = True
 
         # update rotation
         if rotation is not None:
-            self.image = pg.transform.rotate( self.image, rotation )
+            self.rotation = (self.rotation + rotation) % 360
+            changed = True
 
         # check if mouse is hovering
-        self.hovered = hovered
+        if hovered != self.hovered:
+            self.hovered = hovered
+            changed = True
+
+        # only redraw the sprite if its appearance changed
+        if changed:
+            self._updateImage()
+
+        # if
 
     # update
 
 
 # class: SpritePiece
 
+# pre-rendered images of every piece variant, shared by all of the piece sprites
+VARIANTS = SpriteVariants( {
+    None: SpritePiece.COLOR_EMPTY,
+    1   : SpritePiece.COLOR_PLAYER1,
+    2   : SpritePiece.COLOR_PLAYER2,
+} )
+
 class SpriteDiarc( SpritePiece ):
     def __init__( self, x: int = 0, y: int = 0, rotation: float = 0 ):
         super().__init__( x=x, y=y )
 
-        self.image = pg.image.load( 'assets/diarc.png' )
-        self.image = pg.transform.rotate( self.image, rotation )
-        self.image = pg.transform.scale(
-                self.image, (2 * self.image.get_width(), 2 * self.image.get_height()) )
+        if not VARIANTS.hasBaseImage( game.Piece.DIARC ):
+            VARIANTS.setBaseImage( game.Piece.DIARC, ASSETS.getImage( 'diarc.png', scale=2 ) )
+
+        # if
         self.pieceType = game.Piece.DIARC
+        self.rotation = rotation % 360
+        self._updateImage()
 
     # __init__
 
@@ -107,11 +114,13 @@ class SpriteTriarc( SpritePiece ):
     def __init__( self, x: int = 0, y: int = 0, rotation: float = 0 ):
         super().__init__( x=x, y=y )
 
-        self.image = pg.image.load( 'assets/triarc.png' )
-        self.image = pg.transform.rotate( self.image, rotation )
-        self.image = pg.transform.scale(
-                self.image, (2 * self.image.get_width(), 2 * self.image.get_height()) )
+        if not VARIANTS.hasBaseImage( game.Piece.TRIARC ):
+            VARIANTS.setBaseImage( game.Piece.TRIARC, ASSETS.getImage( 'triarc.png', scale=2 ) )
+
+        # if
         self.pieceType = game.Piece.TRIARC
+        self.rotation = rotation % 360
+        self._updateImage()
 
     # __init__
 
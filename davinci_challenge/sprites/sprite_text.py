@@ -0,0 +1,64 @@
+from typing import List, Tuple
+
+import pygame as pg
+
+
+class SpriteText( pg.sprite.DirtySprite ):
+    """ Right-aligned lines of text, optionally on a filled box, only redrawn when they change """
+
+    def __init__(
+            self, font: pg.font.Font, color: Tuple[ int, int, int ], fill: Tuple[ int, int, int ] = None,
+            padding: Tuple[ int, int ] = (0, 0), **position ):
+        """ SpriteText constructor
+
+            :param font: the font to render the text in
+            :param color: the color of the text
+            :param fill: (Optional) the color of the box behind the text (default is no box)
+            :param padding: the (horizontal, vertical) padding between the box and the text
+            :param position: the anchor of the sprite's rect, e.g. topleft=(x, y)
+
+        """
+        super().__init__()
+
+        self.font = font
+        self.color = color
+        self.fill = fill
+        self.padding = padding
+        self.position = position
+
+        self.lines = None
+        self.setLines( [ ] )
+
+    # __init__
+
+    def setLines( self, lines: List[ str ] ):
+        """ Set the lines of text, re-rendering the sprite only if they changed """
+        if lines == self.lines:
+            return
+
+        # if
+        self.lines = list( lines )
+
+        texts = [ self.font.render( line, True, self.color ) for line in self.lines ]
+        width = max( (text.get_width() for text in texts), default=0 )
+        height = sum( text.get_height() for text in texts )
+
+        self.image = pg.Surface( (width + self.padding[ 0 ], height + self.padding[ 1 ]), pg.SRCALPHA )
+        if self.fill is not None:
+            self.image.fill( self.fill )
+
+        # if
+        y = self.padding[ 1 ] // 2
+        for text in texts:
+            self.image.blit( text, (self.padding[ 0 ] // 2 + width - text.get_width(), y) )
+            y += text.get_height()
+
+        # for
+
+        self.rect = self.image.get_rect( **self.position )
+        self.dirty = 1
+
+    # setLines
+
+
+# class: SpriteText
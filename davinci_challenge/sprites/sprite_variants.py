@@ -0,0 +1,103 @@
+from typing import Dict, Optional, Tuple
+
+import pygame as pg
+
+from .sprite_assets import recolored
+
+
+class SpriteVariants:
+    """ Cache of the pre-rendered images of the pieces
+
+        An image is rendered once for each (piece type, rotation, owner, hovered) variant from
+        the piece type's base image, so sprites only ever pick their current variant.
+    """
+
+    def __init__( self, colors: Dict[ Optional[ int ], Tuple[ int, int, int ] ] ):
+        """ SpriteVariants constructor
+
+            :param colors: dict of owner (None if empty, 1 or 2) -> color of the piece
+
+        """
+        self.colors = colors
+
+        self._baseImages = dict()  # piece type -> empty, unrotated image
+        self._images = dict()  # (piece type, rotation, owner, hovered) -> image
+
+    # __init__
+
+    def hasBaseImage( self, pieceType ):
+        return pieceType in self._baseImages
+
+    # hasBaseImage
+
+    def setBaseImage( self, pieceType, image: pg.Surface ):
+        """ Set the empty, unrotated image of a piece type, dropping its rendered variants """
+        self._baseImages[ pieceType ] = image
+        self._images = { key: variant for key, variant in self._images.items() if key[ 0 ] != pieceType }
+
+    # setBaseImage
+
+    def getImage( self, pieceType, rotation: float, owner: Optional[ int ], hovered: bool ) -> pg.Surface:
+        """ Get the image of a piece variant, rendering it if it is not cached yet
+
+            :param pieceType: the piece type (see game.Piece)
+            :param rotation: the rotation of the piece in degrees
+            :param owner: the owner of the piece (None if empty, 1 or 2)
+            :param hovered: whether the mouse is hovering over the piece
+
+            :returns: the shared image of the variant, which must not be drawn on
+        """
+        key = (pieceType, rotation % 360, owner, hovered)
+        image = self._images.get( key )
+        if image is None:
+            image = self._images[ key ] = self._render( *key )
+
+        # if
+
+        return image
+
+    # getImage
+
+    def prerender( self, pieceType, rotation: float ):
+        """ Render every owner and hover variant of a piece type at a rotation """
+        for owner in self.colors:
+            for hovered in (False, True):
+                self.getImage( pieceType, rotation, owner, hovered )
+
+            # for
+        # for
+
+    # prerender
+
+    def _render( self, pieceType, rotation: float, owner: Optional[ int ], hovered: bool ):
+        """ Render the image of a piece variant """
+        replacements = dict()
+        color = self.colors[ owner ]
+        if owner is not None:
+            replacements[ self.colors[ None ] ] = color
+
+        # if
+        if hovered:
+            replacements[ color ] = tuple( min( 255, c + 50 ) for c in color )
+
+        # if
+
+        # the base image is shared, so it is only recolored as a copy
+        image = recolored( self._baseImages[ pieceType ], replacements )
+        if rotation:
+            image = pg.transform.rotate( image, rotation )
+
+        # if
+
+        # convert to the display's pixel format for fast blits
+        if pg.display.get_surface() is not None:
+            image = image.convert_alpha()
+
+        # if
+
+        return image
+
+    # _render
+
+
+# class: SpriteVariants
@@ -0,0 +1,306 @@
+import math
+
+from typing import (
+    List,
+    Sequence,
+    Tuple,
+)
+
+# package imports
+from game import Board, Pattern, Piece, PATTERN_TABLE
+
+
+def _latticePositions():
+    """ Positions of the cells (see Board.getCell) on the board's triangular lattice
+
+        The board is a hexagon of side 3 on a triangular lattice: the diarcs are its 90 edges
+        and the triarcs are its 54 triangles. The lattice's vertices lie on 7 vertical lines, so
+        straight diarc column c lies on line c / 2, angled diarc column c between lines (c - 1) / 2
+        and (c + 1) / 2. The triarc columns run across the board the other way (see the board
+        in ui.py), so triarc column c lies in the strip of mirrored column m = 11 - c, between
+        lines m // 2 and m // 2 + 1, pointing away from its base edge. A diarc is placed at its
+        edge's midpoint and a triarc at its triangle's centroid, in units of the lattice's side
+        length.
+
+        :returns: list of the (x, y) position of each cell
+    """
+    line_spacing = math.sqrt( 3 ) / 2
+
+    def lineVertices( line: int ):
+        """ y of the vertices of a vertical lattice line, top to bottom """
+        num_vertices = 7 - abs( 3 - line )
+        first = (7 - num_vertices) / 2
+
+        return [ first + i for i in range( num_vertices ) ]
+
+    # lineVertices
+
+    positions = [ ]
+    for location in range( Board.NUM_DIARCS ):
+        row, col = Board.getRowColumn( Piece.DIARC, location )
+        if col % 2 == 0:  # straight
+            ys = lineVertices( col // 2 )
+            positions.append( (col // 2 * line_spacing, (ys[ row ] + ys[ row + 1 ]) / 2) )
+
+        else:  # angled: edges between neighboring lines, top to bottom
+            left, right = (col - 1) // 2, (col + 1) // 2
+            edges = sorted(
+                    (y_left + y_right) / 2
+                    for y_left in lineVertices( left ) for y_right in lineVertices( right )
+                    if abs( y_left - y_right ) == 0.5
+            )
+            positions.append( ((left + right) / 2 * line_spacing, edges[ row ]) )
+
+        # else
+    # for
+
+    for location in range( Board.NUM_TRIARCS ):
+        row, col = Board.getRowColumn( Piece.TRIARC, location )
+        mirrored = 11 - col
+        base, apex = (mirrored // 2, mirrored // 2 + 1) if mirrored % 2 == 0 else (mirrored // 2 + 1, mirrored // 2)
+        ys = lineVertices( base )
+        positions.append( ((2 * base + apex) / 3 * line_spacing, (ys[ row ] + ys[ row + 1 ]) / 2) )
+
+    # for
+
+    return positions
+
+# _latticePositions
+
+
+def _geometricSymmetries() -> List[ Tuple[ int, ... ] ]:
+    """ Cell permutations of the 12 rotations and reflections of the hexagonal board
+
+        :returns: list of the permutations, each mapping a cell to its image, starting with the
+                  identity
+    """
+    positions = _latticePositions()
+
+    # a triarc borders a diarc when the diarc's edge is one of its triangle's, i.e. the edge's
+    # midpoint is at the triangle's inradius from its centroid
+    inradius = math.sqrt( 3 ) / 6
+    for instance in PATTERN_TABLE.instances:
+        if instance.pattern is Pattern.DIAMOND:
+            diarc, = instance.diarcs
+            assert all(
+                    math.isclose( math.dist( positions[ diarc ], positions[ Board.NUM_DIARCS + triarc ] ), inradius )
+                    for triarc in instance.triarcs
+            ), f"The triarcs of the Diamond of diarc {diarc} do not border it!"
+
+        # if
+    # for
+
+    center_x = sum( x for x, _ in positions ) / len( positions )
+    center_y = sum( y for _, y in positions ) / len( positions )
+    cells = {
+        (round( x - center_x, 6 ), round( y - center_y, 6 )): cell
+        for cell, (x, y) in enumerate( positions )
+    }
+
+    symmetries = [ ]
+    for reflect in (False, True):
+        for rotation in range( 6 ):
+            angle = rotation * math.pi / 3
+            cos, sin = math.cos( angle ), math.sin( angle )
+            permutation = [ ]
+            for x, y in positions:
+                x, y = x - center_x, y - center_y
+                if reflect:
+                    x = -x
+
+                # if
+                image = (round( x * cos - y * sin, 6 ), round( x * sin + y * cos, 6 ))
+                permutation.append( cells[ image ] )
+
+            # for
+            symmetries.append( tuple( permutation ) )
+
+        # for
+    # for
+
+    return symmetries
+
+# _geometricSymmetries
+
+
+def _preservesPatterns( permutation: Tuple[ int, ... ] ):
+    """ Check whether a cell permutation maps every pattern instance onto a pattern instance """
+    instances = {
+        (
+            instance.pattern,
+            frozenset( instance.diarcs + tuple( Board.NUM_DIARCS + t for t in instance.triarcs ) ),
+        )
+        for instance in PATTERN_TABLE.instances
+    }
+
+    return all(
+            (pattern, frozenset( permutation[ cell ] for cell in cells )) in instances
+            for pattern, cells in instances
+    )
+
+# _preservesPatterns
+
+
+def _inverse( permutation: Tuple[ int, ... ] ):
+    """ Inverse of a cell permutation """
+    inverse = [ 0 ] * len( permutation )
+    for cell, image in enumerate( permutation ):
+        inverse[ image ] = cell
+
+    # for
+
+    return tuple( inverse )
+
+# _inverse
+
+
+def _cellKeys( permutation: Tuple[ int, ... ] ):
+    """ [owner][cell] Zobrist keys of the cells' images under a permutation """
+    keys = [ ]
+    for owner in range( 3 ):
+        keys.append( tuple(
+                Board.ZOBRIST_DIARCS[ owner ][ image ] if image < Board.NUM_DIARCS else
+                Board.ZOBRIST_TRIARCS[ owner ][ image - Board.NUM_DIARCS ]
+                for image in permutation
+        ) )
+
+    # for
+
+    return keys
+
+# _cellKeys
+
+
+# every rotation and reflection of the board, whether or not the scoring patterns respect it
+GEOMETRIC_SYMMETRIES = _geometricSymmetries()
+
+# the symmetries of the game: those mapping the pattern instances onto themselves, so that
+# symmetric positions have the same score and value (the identity is always first)
+SYMMETRIES = [ permutation for permutation in GEOMETRIC_SYMMETRIES if _preservesPatterns( permutation ) ]
+INVERSES = [ _inverse( permutation ) for permutation in SYMMETRIES ]
+CELL_KEYS = [ _cellKeys( permutation ) for permutation in SYMMETRIES ]
+
+
+def transformCell( cell: int, symmetry: int ):
+    """ Map a cell (see Board.getCell) by one of the SYMMETRIES """
+    return SYMMETRIES[ symmetry ][ cell ]
+
+# transformCell
+
+
+def inverseCell( cell: int, symmetry: int ):
+    """ Map a cell (see Board.getCell) by the inverse of one of the SYMMETRIES """
+    return INVERSES[ symmetry ][ cell ]
+
+# inverseCell
+
+
+def transformMove( move: int, symmetry: int ):
+    """ Map an encoded move (see Board.encodeMove) by one of the SYMMETRIES """
+    return (move & ~Board.MOVE_CELL_MASK) | SYMMETRIES[ symmetry ][ move & Board.MOVE_CELL_MASK ]
+
+# transformMove
+
+
+def inverseMove( move: int, symmetry: int ):
+    """ Map an encoded move (see Board.encodeMove) by the inverse of one of the SYMMETRIES """
+    return (move & ~Board.MOVE_CELL_MASK) | INVERSES[ symmetry ][ move & Board.MOVE_CELL_MASK ]
+
+# inverseMove
+
+
+def transformCells( cells: Sequence[ int ], symmetry: int ):
+    """ Map the cell owners of a board (see Board.toArray) by one of the SYMMETRIES
+
+        :param cells: the owner of each cell
+        :param symmetry: index of the symmetry
+
+        :returns: tuple of the owner of each cell of the image
+    """
+    image = [ 0 ] * len( cells )
+    for cell, target in enumerate( SYMMETRIES[ symmetry ] ):
+        image[ target ] = cells[ cell ]
+
+    # for
+
+    return tuple( image )
+
+# transformCells
+
+
+def canonicalCells( cells: Sequence[ int ] ):
+    """ Canonical form of the cell owners of a board: the smallest of their symmetric images
+
+        Unlike canonicalKey, the form is exact, so it can key caches that must not collide.
+
+        :param cells: the owner of each cell (see Board.toArray)
+
+        :returns: (tuple of the canonical cell owners, index of the symmetry mapping the cells
+                  to their canonical form)
+    """
+    images = [ transformCells( cells, symmetry ) for symmetry in range( len( SYMMETRIES ) ) ]
+    symmetry = min( range( len( images ) ), key=images.__getitem__ )
+
+    return images[ symmetry ], symmetry
+
+# canonicalCells
+
+
+def symmetricKeys( board: Board ):
+    """ Zobrist keys of the board's images under each of the SYMMETRIES
+
+        :param board: the board to hash
+
+        :returns: list of the keys, the first of which (the identity) is the board's key
+    """
+    occupied = [ (cell, owner) for cell, owner in enumerate( board.toArray().tolist() ) if owner != 0 ]
+    keys = [ ]
+    for cell_keys in CELL_KEYS:
+        key = 0
+        for cell, owner in occupied:
+            key ^= cell_keys[ owner ][ cell ]
+
+        # for
+        keys.append( key )
+
+    # for
+
+    return keys
+
+# symmetricKeys
+
+
+def canonicalKey( board: Board ):
+    """ Hash a board by its canonical form: the smallest key of its symmetric images
+
+        :param board: the board to hash
+
+        :returns: (canonical key, index of the symmetry mapping the board to its canonical form)
+    """
+    keys = symmetricKeys( board )
+    symmetry = min( range( len( keys ) ), key=keys.__getitem__ )
+
+    return keys[ symmetry ], symmetry
+
+# canonicalKey
+
+
+def canonicalMoveCell( board: Board, cell: int ):
+    """ Canonical key of a board and the canonical form of a cell played on it
+
+        A board that is symmetric to itself, e.g. the empty board, is mapped to its canonical form
+        by several of the SYMMETRIES, and they map a cell played on it to different cells. The
+        smallest of those cells is its canonical form, so that symmetric moves share it.
+
+        :param board: the board the cell is played on
+        :param cell: the cell (see Board.getCell) played
+
+        :returns: (canonical key, canonical cell). Mapping the canonical cell by the inverse of
+                  the symmetry from canonicalKey gives a move symmetric to the cell's.
+    """
+    keys = symmetricKeys( board )
+    key = min( keys )
+
+    return key, min( transformCell( cell, symmetry ) for symmetry, image in enumerate( keys ) if image == key )
+
+# canonicalMoveCell
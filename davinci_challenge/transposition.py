@@ -0,0 +1,118 @@
+from array import array
+
+
+class TranspositionTable:
+    """ Fixed-size, two-tier transposition table keyed by Zobrist hash
+
+        The table is a set of 2-entry buckets stored in typed arrays, so its memory never grows
+        past the size it was created with. The first entry of a bucket is depth-preferred: it is
+        only replaced by searches at least as deep. The second entry is always replaced.
+    """
+    # bound types of a stored score
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # no best move stored
+    NO_MOVE = 0xFFFF
+
+    # bytes used per entry: key (8), score (4), depth (1), bound (1), move (2)
+    ENTRY_BYTES = 16
+
+    def __init__( self, sizeMB: float = 16 ):
+        """ TranspositionTable constructor
+
+            :param sizeMB: the memory limit of the table in megabytes
+
+        """
+        if sizeMB <= 0:
+            raise ValueError( "sizeMB must be > 0!" )
+
+        # if
+
+        # number of buckets as a power of 2 fitting in the memory limit
+        num_buckets = max( 1, int( sizeMB * 2 ** 20 ) // (2 * self.ENTRY_BYTES) )
+        num_buckets = 1 << (num_buckets.bit_length() - 1)
+
+        self.size = 2 * num_buckets
+        self._mask = num_buckets - 1
+
+        self.keys = array( 'Q', bytes( 8 * self.size ) )
+        self.scores = array( 'i', bytes( 4 * self.size ) )
+        self.depths = array( 'b', bytes( self.size ) )
+        self.bounds = array( 'b', bytes( self.size ) )
+        self.moves = array( 'H', [ self.NO_MOVE ] ) * self.size
+
+        # statistics
+        self.hits = 0
+        self.probes = 0
+
+    # __init__
+
+    def clear( self ):
+        """ Remove all of the entries from the table """
+        self.keys = array( 'Q', bytes( 8 * self.size ) )
+        self.depths = array( 'b', bytes( self.size ) )
+        self.moves = array( 'H', [ self.NO_MOVE ] ) * self.size
+
+        self.hits = 0
+        self.probes = 0
+
+    # clear
+
+    def probe( self, key: int ):
+        """ Look up a position
+
+            :param key: the Zobrist hash of the position
+
+            :returns: (depth, score, bound, encoded move) of the entry, None if not stored
+        """
+        self.probes += 1
+        index = (key & self._mask) << 1
+        for i in (index, index + 1):
+            if self.keys[ i ] == key and (self.depths[ i ] > 0 or self.moves[ i ] != self.NO_MOVE):
+                self.hits += 1
+                return self.depths[ i ], self.scores[ i ], self.bounds[ i ], self.moves[ i ]
+
+            # if
+        # for
+
+        return None
+
+    # probe
+
+    def store( self, key: int, depth: int, score: int, bound: int, move: int = NO_MOVE ):
+        """ Store a search result
+
+            :param key: the Zobrist hash of the position
+            :param depth: the depth the position was searched to
+            :param score: the score of the position
+            :param bound: the bound type of the score (EXACT, LOWER or UPPER)
+            :param move: (Optional) the encoded best move of the position (see Board.encodeMove)
+
+        """
+        index = (key & self._mask) << 1
+
+        # depth-preferred entry, falling back on the always-replace entry
+        if (self.keys[ index ] == key) or (depth >= self.depths[ index ]):
+            i = index
+
+        else:
+            i = index + 1
+
+        # keep the previous best move of the position if none was found
+        if (move == self.NO_MOVE) and (self.keys[ i ] == key):
+            move = self.moves[ i ]
+
+        # if
+
+        self.keys[ i ] = key
+        self.depths[ i ] = depth
+        self.scores[ i ] = score
+        self.bounds[ i ] = bound
+        self.moves[ i ] = move
+
+    # store
+
+
+# class: TranspositionTable
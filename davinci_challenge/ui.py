@@ -20,18 +20,39 @@ class GameApplication:
     WIDTH, HEIGHT = 750, 750
     FPS = 30  # frames per second
 
-    def __init__( self ):
+    def __init__( self, fps: int = FPS, vsync: bool = False ):
+        """ GameApplication constructor
+
+            :param fps: (Optional) the frame rate to cap the main loop at, None for uncapped,
+                        e.g. for benchmarking (default is FPS)
+            :param vsync: (Optional) whether to sync the frames with the display's refresh
+                          instead of capping the frame rate (default is False)
+
+        """
         pg.init()
         self.game = Game()  # create a new game
+        self.fps = None if vsync else fps
 
         # set-up screen
-        self.screen = pg.display.set_mode( (self.WIDTH, self.HEIGHT) )
+        if vsync:
+            self.screen = pg.display.set_mode( (self.WIDTH, self.HEIGHT), pg.SCALED, vsync=1 )
+
+        else:
+            self.screen = pg.display.set_mode( (self.WIDTH, self.HEIGHT) )
+
+        # else
         pg.display.set_caption( "Da Vinci's Challenge" )
 
-        # setup background
+        # setup the font
+        self._titleFont = pg.font.SysFont( 'arialblack', 50 )
+        self._elementFont = pg.font.SysFont( 'arialblack', 24 )
+
+        # setup background, with the title drawn onto it once
         self.background = pg.Surface( self.screen.get_size() )
         self.background = self.background.convert()
         self.background.fill( COLOR_GRAY )
+        title = self._titleFont.render( "DaVinci's Challenge", True, COLOR_WHITE )
+        self.background.blit( title, ((self.background.get_width() - title.get_width()) // 2, 10) )
 
         # FPS clock
         self.clock = pg.time.Clock()
@@ -41,13 +62,38 @@ class GameApplication:
                         range( Board.NUM_DIARCS ) ]
         self.triarcs = [ sprites.SpriteTriarc( x=-100, y=-100 ) for _ in
                          range( Board.NUM_TRIARCS ) ]
+        self._hoveredPiece, self._hoveredIndex = None, None
 
         # build the board
         self.buildBoard()
 
-        # setup the font
-        self._titleFont = pg.font.SysFont( 'arialblack', 50 )
-        self._elementFont = pg.font.SysFont( 'arialblack', 24 )
+        # pre-render every variant of the pieces on the board
+        for piece_type, rotation in { (piece.pieceType, piece.rotation) for piece in self.pieces }:
+            sprites.VARIANTS.prerender( piece_type, rotation )
+
+        # for
+
+        # player piece counts and scores
+        rect_buffer = (10, 15)
+        panel_top = 30 + title.get_height() - rect_buffer[ 1 ] // 2
+        self.player1Panel = sprites.SpriteText(
+                self._elementFont, COLOR_WHITE, COLOR_BLUE, rect_buffer,
+                topleft=(10 - rect_buffer[ 0 ] // 2, panel_top) )
+        self.player2Panel = sprites.SpriteText(
+                self._elementFont, COLOR_WHITE, COLOR_RED, rect_buffer,
+                topright=(self.screen.get_width() - rect_buffer[ 0 ] // 2, panel_top) )
+
+        # TODO: remove | for debugging purposes only
+        self.hoverLabel = sprites.SpriteText(
+                self._elementFont, COLOR_WHITE,
+                topright=(self.screen.get_width() - 15, self.screen.get_height() - 50) )
+
+        # only the sprites that changed are redrawn, over the background
+        self.allSprites = pg.sprite.LayeredDirty()
+        self.allSprites.add( *self.diarcs, *self.triarcs, layer=0 )
+        self.allSprites.add( self.player1Panel, self.player2Panel, self.hoverLabel, layer=1 )
+        self.allSprites.clear( self.screen, self.background )
+        self.allSprites.repaint_rect( self.screen.get_rect() )
 
     # __init__
 
@@ -177,24 +223,70 @@ class GameApplication:
 
         # for: diarcs
 
+        self.buildPieceMap()
+
     # buildBoard
 
+    def buildPieceMap( self ):
+        """ Build the per-pixel lookup of the piece under each screen position
+
+            A pixel belongs to a piece if it is opaque in the piece's image. Where pieces overlap,
+            it belongs to the piece with the closest center, preferring triarcs on ties.
+        """
+        width, height = self.screen.get_size()
+        screen_rect = self.screen.get_rect()
+
+        # [x, y] -> cell of the piece (see Board.getCell), -1 if there is none
+        self._pieceMap = np.full( (width, height), -1, dtype=np.int16 )
+        distances = np.full( (width, height), np.inf )
+        xs, ys = np.arange( width ), np.arange( height )
+
+        for pieces in (self.triarcs, self.diarcs):
+            for i, piece in enumerate( pieces ):
+                rect = piece.rect.clip( screen_rect )
+                if (rect.width == 0) or (rect.height == 0):
+                    continue
+
+                # if
+
+                opaque = pg.surfarray.array_alpha( piece.image ) > 127
+                opaque = opaque[
+                         rect.left - piece.rect.left:rect.right - piece.rect.left,
+                         rect.top - piece.rect.top:rect.bottom - piece.rect.top ]
+
+                xc, yc = piece.rect.center
+                piece_distances = (
+                        (xs[ rect.left:rect.right, None ] - xc) ** 2 + (ys[ None, rect.top:rect.bottom ] - yc) ** 2
+                )
+                closer = opaque & (piece_distances < distances[ rect.left:rect.right, rect.top:rect.bottom ])
+
+                distances[ rect.left:rect.right, rect.top:rect.bottom ][ closer ] = piece_distances[ closer ]
+                self._pieceMap[ rect.left:rect.right, rect.top:rect.bottom ][ closer ] = Board.getCell(
+                        piece.pieceType, i )
+
+            # for
+        # for
+
+    # buildPieceMap
+
     def handleMouseEvent( self, event: pg.event.Event ):
         """ This is a function to handle the mouse event """
         if event.type == pg.MOUSEMOTION:
             (x, y) = event.pos
 
-            # unhover all pieces
-            for piece in self.pieces:
-                piece.update( hovered=False )
-
             # check for colliding pieces
             update_piece, update_piece_idx = self.selectPiece( x, y )
 
-            if update_piece is not None:
+            # only the previously and newly hovered pieces change
+            if (self._hoveredPiece is not None) and (self._hoveredPiece is not update_piece):
+                self._hoveredPiece.update( hovered=False )
+
+            # if
+            if (update_piece is not None) and not update_piece.hovered:
                 update_piece.update( hovered=True )
 
             # if
+            self._hoveredPiece, self._hoveredIndex = update_piece, update_piece_idx
 
         # if: MouseMotion
 
@@ -211,63 +303,72 @@ class GameApplication:
 
     # handleMouseEvent
 
-    def run( self ):
-        """ Run the game """
+    def run( self, maxFrames: int = None ):
+        """ Run the game
+
+            Each frame drains the event queue, coalescing mouse motion into its latest position,
+            then renders once and waits for the next frame.
+
+            :param maxFrames: (Optional) the number of frames to run, e.g. for benchmarking
+                              (default is to run until the window is closed)
+
+            :returns: the number of frames run
+        """
         run = True
+        frames = 0
         while run:
             # handle the events
+            motion = None
             for event in pg.event.get():
-                self.clock.tick( self.FPS )  # control frame-rate
-                # print( f"Current FPS: {self.clock.get_fps()}" )
                 if event.type == pg.QUIT:
                     run = False
 
-                elif event.type in [ pg.MOUSEWHEEL, pg.MOUSEMOTION, pg.MOUSEBUTTONUP,
-                                     pg.MOUSEBUTTONDOWN ]:
+                elif event.type == pg.MOUSEMOTION:
+                    motion = event  # only the latest position matters
+
+                elif event.type in [ pg.MOUSEWHEEL, pg.MOUSEBUTTONUP, pg.MOUSEBUTTONDOWN ]:
                     self.handleMouseEvent( event )
 
-                # render at the end of the loop
-                self.render()
+                # elif
+            # for
+
+            if motion is not None:
+                self.handleMouseEvent( motion )
+
+            # if
+
+            # render once per frame
+            self.render()
+            frames += 1
+
+            # control frame-rate (vsync or uncapped if there is no fps)
+            if self.fps is not None:
+                self.clock.tick( self.fps )
+
+            else:
+                self.clock.tick()
 
+            # else
+            if (maxFrames is not None) and (frames >= maxFrames):
+                run = False
+
+            # if
         # while
         pg.quit()
 
+        return frames
+
     # run
 
     def render( self ):
-        # blit the background
-        self.screen.blit( self.background, (0, 0) )
-
-        # blit the game interface
-        self.renderGameInterface()
-
-        # blit the pieces onto the screen
-        for idx, piece in enumerate(self.diarcs):
-            piece.blit( self.screen )
-
-            # TODO: remove | for debugging purposes only
-            if piece.hovered:
-                row, col = Board.getRowColumn( piece.pieceType, idx )
-                rowcol_font = self._elementFont.render( f"Diarc: ({row}, {col})", True, COLOR_WHITE )
-                self.screen.blit(
-                    rowcol_font, (
-                                (self.screen.get_width() - rowcol_font.get_width()) - 15,
-                                self.screen.get_height() - 50) )
-        # for: diarcs
-        for idx, piece in enumerate( self.triarcs ):
-            piece.blit( self.screen )
-
-            # TODO: remove | for debugging purposes only
-            if piece.hovered:
-                row, col = Board.getRowColumn( piece.pieceType, idx )
-                rowcol_font = self._elementFont.render( f"Triarc: ({row}, {col})", True, COLOR_WHITE )
-                self.screen.blit(
-                        rowcol_font, (
-                                (self.screen.get_width() - rowcol_font.get_width()) - 15,
-                                self.screen.get_height() - 50) )
-        # for: diarcs
+        """ Redraw the sprites that changed and update only their rects on the display """
+        # update the game interface
+        self.updateGameInterface()
+
+        # draw the changed sprites over the background
+        dirty_rects = self.allSprites.draw( self.screen )
 
-        pg.display.update()
+        pg.display.update( dirty_rects )
 
     # render
 
@@ -286,128 +387,47 @@ class GameApplication:
 
     def selectPiece( self, x, y ):
         """ Get the current Piece under at position x, y"""
-        # initialization
-        min_dist = float( "inf" )
-        select_piece = None
-        select_piece_idx = None
-
-        # go over triarcs
-        for i, piece in enumerate( self.triarcs ):
-            if piece.rect.collidepoint( x, y ):
-                d = piece.distanceFromCenter( x, y )
-                if d < min_dist:
-                    min_dist = d
-                    select_piece = piece
-                    select_piece_idx = i
+        if not ((0 <= x < self._pieceMap.shape[ 0 ]) and (0 <= y < self._pieceMap.shape[ 1 ])):
+            return None, None
 
-                # if
-            # if
-        # for
+        # if
 
-        # go over diarcs
-        for i, piece in enumerate( self.diarcs ):
-            if piece.rect.collidepoint( x, y ):
-                d = piece.distanceFromCenter( x, y )
-                if d < min_dist:
-                    min_dist = d
-                    select_piece = piece
-                    select_piece_idx = i
+        cell = int( self._pieceMap[ x, y ] )
+        if cell < 0:
+            return None, None
 
-                # if
-            # if
-        # for
+        # if
 
-        return select_piece, select_piece_idx
+        piece, location = Board.getPieceLocation( cell )
+        select_piece = self.diarcs[ location ] if piece is Piece.DIARC else self.triarcs[ location ]
 
-    def renderGameInterface( self ):
-        """ Draw the scores and piece counts """
-        # get screen size
-        screen_W, screen_H = self.screen.get_size()
+        return select_piece, location
 
-        # blit the title
-        title = self._titleFont.render( "DaVinci's Challenge", True, COLOR_WHITE )
-        self.screen.blit( title, ((screen_W - title.get_width()) // 2, 10) )
+    # selectPiece
 
-        # player piece counts and scores
-        rect_buffer = (10, 15)
-        player1Diarcs = self._elementFont.render(
-                f"Diarcs: {self.game.player1.diarcs:2d}", True, COLOR_WHITE )
-        player1Triarcs = self._elementFont.render(
-                f"Triarcs: {self.game.player1.triarcs:2d}", True, COLOR_WHITE )
-        player1Score = self._elementFont.render(
-                f"Score: {self.game.player1Score:3d}", True, COLOR_WHITE )
-        p1_maxWidth = max(
-                [ player1Diarcs.get_width(), player1Triarcs.get_width(),
-                  player1Score.get_width() ] )
-        player1Rect = pg.Rect(
-                10 - rect_buffer[ 0 ] // 2, 30 + title.get_height() - rect_buffer[ 1 ] // 2,
-                p1_maxWidth + rect_buffer[ 0 ],
-                player1Triarcs.get_height() + player1Triarcs.get_height() + player1Score.get_height() +
-                rect_buffer[ 1 ] )
-
-        player2Diarcs = self._elementFont.render(
-                f"Diarcs: {self.game.player2.diarcs:2d}", True, COLOR_WHITE )
-        player2Triarcs = self._elementFont.render(
-                f"Triarcs: {self.game.player2.triarcs:2d}", True, COLOR_WHITE )
-        player2Score = self._elementFont.render(
-                f"Score: {self.game.player2Score:3d}", True, COLOR_WHITE )
-        p2_maxWidth = max(
-                [ player2Diarcs.get_width(), player2Triarcs.get_width(),
-                  player2Score.get_width() ] )
-        player2Rect = pg.Rect(
-                screen_W - rect_buffer[ 0 ] // 2 - p2_maxWidth - 10,
-                30 + title.get_height() - rect_buffer[ 1 ] // 2,
-                p2_maxWidth + rect_buffer[ 0 ],
-                player2Triarcs.get_height() + player2Triarcs.get_height() + player2Score.get_height() +
-                rect_buffer[ 1 ] )
-
-        # draw player piece counts and scores
-        pg.draw.rect( self.screen, (0, 0, 255), player1Rect )
-        self.screen.blit(
-                player1Diarcs, tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player1Rect.topleft, rect_buffer,
-                                (p1_maxWidth - player1Diarcs.get_width(), 0) ) ) )
-        self.screen.blit(
-                player1Triarcs, tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player1Rect.topleft, rect_buffer,
-                                (p1_maxWidth - player1Triarcs.get_width(),
-                                 player1Diarcs.get_height()) ) ) )
-        self.screen.blit(
-                player1Score,
-                tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player1Rect.topleft, rect_buffer,
-                                (p1_maxWidth - player1Score.get_width(),
-                                 player1Diarcs.get_height() + player1Triarcs.get_height()) ) ) )
-
-        pg.draw.rect( self.screen, (255, 0, 0), player2Rect )
-        self.screen.blit(
-                player2Diarcs, tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player2Rect.topleft, rect_buffer,
-                                (p2_maxWidth - player2Diarcs.get_width(), 0) ) ) )
-        self.screen.blit(
-                player2Triarcs, tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player2Rect.topleft, rect_buffer,
-                                (p2_maxWidth - player2Triarcs.get_width(),
-                                 player2Diarcs.get_height()) ) ) )
-        self.screen.blit(
-                player2Score,
-                tuple(
-                        pos + buff // 2 + offset for pos, buff, offset in
-                        zip(
-                                player2Rect.topleft, rect_buffer,
-                                (p2_maxWidth - player2Score.get_width(),
-                                 player2Diarcs.get_height() + player2Triarcs.get_height()) ) ) )
-
-    # renderGameInterface
+    def updateGameInterface( self ):
+        """ Update the scores and piece counts, which are only redrawn when they change """
+        self.player1Panel.setLines( [
+            f"Diarcs: {self.game.player1.diarcs:2d}",
+            f"Triarcs: {self.game.player1.triarcs:2d}",
+            f"Score: {self.game.player1Score:3d}",
+        ] )
+        self.player2Panel.setLines( [
+            f"Diarcs: {self.game.player2.diarcs:2d}",
+            f"Triarcs: {self.game.player2.triarcs:2d}",
+            f"Score: {self.game.player2Score:3d}",
+        ] )
+
+        # TODO: remove | for debugging purposes only
+        if (self._hoveredPiece is not None) and self._hoveredPiece.hovered:
+            row, col = Board.getRowColumn( self._hoveredPiece.pieceType, self._hoveredIndex )
+            self.hoverLabel.setLines( [ f"{self._hoveredPiece.pieceType.name.title()}: ({row}, {col})" ] )
+
+        else:
+            self.hoverLabel.setLines( [ ] )
+
+        # else
+
+    # updateGameInterface
 
 # class: GameApplication
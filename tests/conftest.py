@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the package's modules import each other by their flat names (see davinci_challenge/main.py)
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ), 'davinci_challenge' ) )
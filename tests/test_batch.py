@@ -0,0 +1,106 @@
+import numpy as np
+
+from batch import GameBatch
+from bitboard import BitBoard
+from game import Board, Game
+
+
+def assertSameGame( game: Game, other: Game ):
+    """ Check that two games on different boards are in the same state """
+    assert game.board.toArray().tolist() == other.board.toArray().tolist()
+    assert game.board.key == other.board.key == game.board.computeKey()
+    assert game.board.isFilled() == other.board.isFilled()
+    assert (game.player1Score, game.player2Score, game.turn) == \
+           (other.player1Score, other.player2Score, other.turn)
+    assert list( game.legalCells() ) == list( other.legalCells() )
+    assert game.scoreAllMoves().tolist() == other.scoreAllMoves().tolist()
+
+# assertSameGame
+
+
+def assertMatchesBatch( batch: GameBatch, i: int, game: Game ):
+    """ Check that a game of a batch is in the same state as a game """
+    assert batch.cells[ i ].tolist() == game.board.toArray().tolist()
+    assert batch.scores[ i, 1: ].tolist() == [ game.player1Score, game.player2Score ]
+    assert batch.turn[ i ] == game.turn
+    assert batch.isFilled()[ i ] == game.board.isFilled()
+
+    for player in (game.player1, game.player2):
+        assert batch.pieces[ i, player.number ].tolist() == [ player.diarcs, player.triarcs ]
+
+    # for
+
+    legal = batch.legalMoves()[ i ]
+    assert np.flatnonzero( legal ).tolist() == sorted( game.legalCells() )
+
+    scores = game.scoreAllMoves()
+    assert batch.scoreMoves()[ i ].tolist() == scores.tolist()
+    for cell in game.legalCells():
+        piece, location = Board.getPieceLocation( cell )
+        assert scores[ cell ] == game.checkScore( Board.encodeMove( piece, location, game.turn ) )
+
+    # for
+
+# assertMatchesBatch
+
+
+def test_batch_matches_games():
+    rng = np.random.default_rng( 0 )
+    num_games = 6
+    batch = GameBatch( num_games )
+    games = [ Game( Board() ) for _ in range( num_games ) ]
+    bit_games = [ Game( BitBoard() ) for _ in range( num_games ) ]
+
+    while not batch.isFilled().all():
+        for i in range( num_games ):
+            assertSameGame( games[ i ], bit_games[ i ] )
+            assertMatchesBatch( batch, i, games[ i ] )
+
+        # for
+
+        moves = batch.randomMoves( rng )
+        updates = batch.step( moves )
+        for i, cell in enumerate( moves.tolist() ):
+            if cell == GameBatch.NO_MOVE:
+                assert games[ i ].board.isFilled()
+                continue
+
+            # if
+            piece, location = Board.getPieceLocation( cell )
+            move = Board.encodeMove( piece, location, games[ i ].turn )
+            assert games[ i ].make( move ) == bit_games[ i ].make( move ) == updates[ i ]
+
+        # for
+    # while
+
+    for i in range( num_games ):
+        assertSameGame( games[ i ], bit_games[ i ] )
+        assertMatchesBatch( batch, i, games[ i ] )
+
+    # for
+
+    # some of the games scored, so the scores were compared on more than zeros
+    assert batch.scores.sum() > 0
+
+
+# test_batch_matches_games
+
+
+def test_from_games():
+    rng = np.random.default_rng( 1 )
+    games = [ Game( BitBoard() ) for _ in range( 4 ) ]
+    for plies, game in zip( (0, 1, 30, 80), games ):
+        for _ in range( plies ):
+            game.make( rng.choice( list( game.legalCodes() ) ) )
+
+        # for
+    # for
+
+    batch = GameBatch.fromGames( games )
+    for i, game in enumerate( games ):
+        assertMatchesBatch( batch, i, game )
+
+    # for
+
+
+# test_from_games
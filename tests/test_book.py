@@ -0,0 +1,78 @@
+import random
+
+from bitboard import BitBoard
+from book import OpeningBook
+from game import Board, Game
+from records import GameRecord
+from symmetry import SYMMETRIES, canonicalMoveCell, transformCell
+
+
+def recordOf( cells, player1Score: int = 1, player2Score: int = 0 ):
+    return GameRecord( bytes( cells ), player1Score, player2Score )
+
+# recordOf
+
+
+def play( cells ):
+    game = Game( BitBoard() )
+    for cell in cells:
+        piece, location = Board.getPieceLocation( cell )
+        assert game.make( Board.encodeMove( piece, location, game.turn ) ) is not None
+
+    # for
+
+    return game
+
+# play
+
+
+def test_symmetric_first_moves_share_statistics():
+    book = OpeningBook.build( [ recordOf( [ cell ] ) for cell in range( Board.NUM_PIECES ) ], maxPlies=1 )
+
+    moves, = book.entries.values()
+    assert sum( games for games, _ in moves.values() ) == Board.NUM_PIECES
+    # the first moves fall into the orbits of the cells under the symmetries
+    orbits = { min( transformCell( cell, s ) for s in range( len( SYMMETRIES ) ) ) for cell in range( Board.NUM_PIECES ) }
+    assert set( moves ) == orbits
+
+
+# test_symmetric_first_moves_share_statistics
+
+
+def test_lookup_in_symmetric_position():
+    rng = random.Random( 0 )
+    cells = [ ]
+    game = Game( BitBoard() )
+    for _ in range( 4 ):
+        move = rng.choice( tuple( game.legalCodes() ) )
+        game.make( move )
+        cells.append( move & Board.MOVE_CELL_MASK )
+
+    # for
+    book = OpeningBook.build( [ recordOf( cells ) ], maxPlies=4 )
+
+    for symmetry in range( len( SYMMETRIES ) ):
+        image = [ transformCell( cell, symmetry ) for cell in cells ]
+        for ply in range( len( cells ) ):
+            position = play( image[ :ply ] )
+            move = book.lookup( position )
+            assert move is not None
+            cell = Board.getCell( move.piece, move.location )
+            assert canonicalMoveCell( position.board, cell ) == canonicalMoveCell( position.board, image[ ply ] )
+
+        # for
+    # for
+
+
+# test_lookup_in_symmetric_position
+
+
+def test_save_load( tmp_path ):
+    book = OpeningBook.build( [ recordOf( [ 0, 100, 5 ] ), recordOf( [ 90, 1 ], 0, 3 ) ], maxPlies=3 )
+    path = str( tmp_path / "book.bin" )
+    book.save( path )
+
+    assert OpeningBook.load( path ).entries == book.entries
+
+
+# test_save_load
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from game import Board, Game, Piece
+from player import Player
+
+
+def test_make_unmake():
+    game = Game()
+    assert game.make( Board.encodeMove( Piece.DIARC, 0, 1 ) ) == 0
+    assert (game.turn, game.board.diarcs[ 0 ]) == (2, 1)
+
+    assert game.unmake() == Board.encodeMove( Piece.DIARC, 0, 1 )
+    assert (game.turn, game.board.diarcs[ 0 ]) == (1, 0)
+    assert game.unmake() is None
+
+
+# test_make_unmake
+
+
+def test_make_out_of_turn():
+    game = Game()
+    assert game.make( Board.encodeMove( Piece.DIARC, 0, 2 ) ) is None
+    assert game.make( Board.Move( 0, Piece.DIARC, game.player2 ) ) is None
+    assert (game.turn, game.board.diarcs[ 0 ], game.unmake()) == (1, 0, None)
+
+    game.make( Board.encodeMove( Piece.DIARC, 0, 1 ) )
+    assert game.make( Board.encodeMove( Piece.TRIARC, 0, 1 ) ) is None
+    assert game.make( Board.encodeMove( Piece.TRIARC, 0, 2 ) ) == 0
+
+
+# test_make_out_of_turn
+
+
+def test_encode_move():
+    for piece, num_locations in ((Piece.DIARC, Board.NUM_DIARCS), (Piece.TRIARC, Board.NUM_TRIARCS)):
+        for location in range( num_locations ):
+            code = Board.encodeMove( piece, location, 2 )
+            assert Board.decodeMove( code ) == (piece, location, 2)
+            assert Board.decodeMove( np.int64( code ) ) == (piece, location, 2)
+
+        # for
+        for location in (-1, num_locations):
+            with pytest.raises( ValueError ):
+                Board.encodeMove( piece, location, 1 )
+
+            # with
+        # for
+    # for
+
+
+# test_encode_move
+
+
+def test_unpack_move():
+    player1, player2 = Player( 1, 1, 1 ), Player( 2, 1, 1 )
+    code = Board.encodeMove( Piece.TRIARC, 5, 2 )
+
+    assert Board.unpackMove( code, player2 ) == (Piece.TRIARC, 5, player2)
+    assert Board.unpackMove( np.uint16( code ), player2 ) == (Piece.TRIARC, 5, player2)
+    with pytest.raises( ValueError ):
+        Board.unpackMove( code, player1 )
+
+    # with
+    with pytest.raises( ValueError ):
+        Board.unpackMove( code )
+
+    # with
+    board = Board()
+    with pytest.raises( ValueError ):
+        board.playPiece( code, player1 )
+
+    # with
+    assert board.triarcs[ 5 ] == 0
+
+
+# test_unpack_move
@@ -0,0 +1,98 @@
+from game import Board, Pattern, PatternTable, Piece, PATTERN_TABLE
+
+# the diarcs of the Triangle of each triarc, which must share no more than one edge
+TRIANGLES = {
+    (0, 30, 42), (0, 31, 43), (1, 32, 44), (1, 33, 45), (2, 34, 46), (2, 35, 47),
+    (3, 36, 48), (3, 37, 49), (4, 38, 50), (4, 39, 51), (5, 40, 52), (5, 41, 53),
+    (6, 32, 42), (6, 54, 64), (7, 33, 43), (7, 55, 65), (8, 34, 44), (8, 56, 66),
+    (9, 35, 45), (9, 57, 67), (10, 36, 46), (10, 58, 68), (11, 37, 47), (11, 59, 69),
+    (12, 38, 48), (12, 60, 70), (13, 39, 49), (13, 61, 71), (14, 40, 50), (14, 62, 72),
+    (15, 41, 51), (15, 63, 73), (16, 56, 64), (16, 74, 82), (17, 57, 65), (17, 75, 83),
+    (18, 58, 66), (18, 76, 84), (19, 59, 67), (19, 77, 85), (20, 60, 68), (20, 78, 86),
+    (21, 61, 69), (21, 79, 87), (22, 62, 70), (22, 80, 88), (23, 63, 71), (23, 81, 89),
+    (24, 76, 82), (25, 77, 83), (26, 78, 84), (27, 79, 85), (28, 80, 86), (29, 81, 87),
+}
+
+
+def instancesOf( pattern: Pattern ):
+    return [ instance for instance in PATTERN_TABLE.instances if instance.pattern is pattern ]
+
+# instancesOf
+
+
+def diarc( row: int, col: int ):
+    return Board.rowColumnToIndex( Piece.DIARC, row, col )
+
+# diarc
+
+
+def test_triangles():
+    triangles = instancesOf( Pattern.TRIANGLE )
+
+    assert len( triangles ) == Board.NUM_TRIARCS
+    assert { instance.diarcs for instance in triangles } == TRIANGLES
+    assert all( not instance.triarcs for instance in triangles )
+
+
+# test_triangles
+
+
+def test_triangles_share_at_most_one_edge():
+    for first in TRIANGLES:
+        for second in TRIANGLES:
+            if first != second:
+                assert len( set( first ) & set( second ) ) <= 1
+
+            # if
+        # for
+    # for
+
+
+# test_triangles_share_at_most_one_edge
+
+
+def test_triangle_edges():
+    # the edges around the middle triarc at the top of the board
+    assert tuple( sorted( (diarc( 0, 6 ), diarc( 0, 5 ), diarc( 1, 5 )) ) ) in TRIANGLES
+
+    # (0, 4) is a vertical edge one line over from (0, 5) and (1, 5)
+    assert tuple( sorted( (diarc( 0, 4 ), diarc( 0, 5 ), diarc( 1, 5 )) ) ) not in TRIANGLES
+
+
+# test_triangle_edges
+
+
+def triarcEdges( triarc: int ):
+    row, col = Board.getRowColumn( Piece.TRIARC, triarc )
+
+    return { diarc( r, c ) for r, c in PatternTable._triarcEdges( row, col ) }
+
+# triarcEdges
+
+
+def test_diamonds():
+    diamonds = instancesOf( Pattern.DIAMOND )
+
+    # the 90 edges of the board less the 18 on its border
+    assert len( diamonds ) == 72
+    assert len( { instance.diarcs for instance in diamonds } ) == len( diamonds )
+
+    # the two triarcs of a Diamond are on either side of its diarc
+    for instance in diamonds:
+        assert len( instance.diarcs ) == 1
+        assert len( instance.triarcs ) == 2
+        for triarc in instance.triarcs:
+            assert instance.diarcs[ 0 ] in triarcEdges( triarc )
+
+        # for
+    # for
+
+
+# test_diamonds
+
+
+def test_triarc_edges_are_triangles():
+    assert { tuple( sorted( triarcEdges( triarc ) ) ) for triarc in range( Board.NUM_TRIARCS ) } == TRIANGLES
+
+
+# test_triarc_edges_are_triangles
@@ -0,0 +1,25 @@
+from selfplay import aggregate, playGame
+
+
+def test_aggregate_identical_strategies():
+    results = [ ]
+    for i in range( 4 ):
+        result, _ = playGame( "random", "random", seed=i )
+        result[ "player1Side" ] = 1 + i % 2
+        results.append( result )
+
+    # for
+    summary = aggregate( results )
+
+    assert sorted( summary ) == [ 1, 2 ]
+    for side, stats in summary.items():
+        assert stats[ "strategy" ] == "random"
+        assert stats[ "games" ] == len( results )
+        assert stats[ "wins" ] + stats[ "draws" ] + stats[ "losses" ] == len( results )
+
+    # for
+    assert summary[ 1 ][ "wins" ] == summary[ 2 ][ "losses" ]
+    assert summary[ 1 ][ "draws" ] == summary[ 2 ][ "draws" ]
+
+
+# test_aggregate_identical_strategies
@@ -0,0 +1,135 @@
+import random
+
+from benchmark import randomPosition
+from bitboard import BitBoard
+from game import Board, Game
+from search import AlphaBetaSearch
+from symmetry import (
+    SYMMETRIES,
+    canonicalCells,
+    canonicalKey,
+    inverseCell,
+    inverseMove,
+    symmetricKeys,
+    transformCell,
+    transformCells,
+    transformMove,
+    _preservesPatterns,
+)
+
+
+def playGame( seed: int, plies: int ):
+    """ Encoded moves of a random game """
+    rng = random.Random( seed )
+    game, moves = Game( BitBoard() ), [ ]
+    for _ in range( plies ):
+        move = rng.choice( tuple( game.legalCodes() ) )
+        game.make( move )
+        moves.append( move )
+
+    # for
+
+    return moves
+
+# playGame
+
+
+def test_symmetries():
+    # the 6 rotations and 6 reflections of the hexagon, starting with the identity
+    assert len( SYMMETRIES ) == 12
+    assert SYMMETRIES[ 0 ] == tuple( range( Board.NUM_PIECES ) )
+    assert len( set( SYMMETRIES ) ) == len( SYMMETRIES )
+
+    group = set( SYMMETRIES )
+    for first in SYMMETRIES:
+        assert _preservesPatterns( first )
+        for second in SYMMETRIES:
+            assert tuple( first[ cell ] for cell in second ) in group
+
+        # for
+    # for
+
+
+# test_symmetries
+
+
+def test_cell_round_trip():
+    for symmetry in range( len( SYMMETRIES ) ):
+        for cell in range( Board.NUM_PIECES ):
+            assert inverseCell( transformCell( cell, symmetry ), symmetry ) == cell
+            # a symmetry maps diarcs to diarcs and triarcs to triarcs
+            assert (cell < Board.NUM_DIARCS) == (transformCell( cell, symmetry ) < Board.NUM_DIARCS)
+
+        # for
+    # for
+
+
+# test_cell_round_trip
+
+
+def test_symmetric_games():
+    moves = playGame( 0, 60 )
+    for symmetry in range( len( SYMMETRIES ) ):
+        game, image = Game( BitBoard() ), Game( BitBoard() )
+        for move in moves:
+            assert game.make( move ) == image.make( transformMove( move, symmetry ) )
+            assert (image.player1Score, image.player2Score) == (game.player1Score, game.player2Score)
+            assert inverseMove( transformMove( move, symmetry ), symmetry ) == move
+
+        # for
+
+        cells = game.board.toArray().tolist()
+        assert list( transformCells( cells, symmetry ) ) == image.board.toArray().tolist()
+        assert symmetricKeys( game.board )[ symmetry ] == image.board.key
+        assert canonicalKey( game.board )[ 0 ] == canonicalKey( image.board )[ 0 ]
+        assert canonicalCells( cells )[ 0 ] == canonicalCells( image.board.toArray().tolist() )[ 0 ]
+
+    # for
+
+
+# test_symmetric_games
+
+
+def test_canonical_key():
+    game = randomPosition( 30, 1, BitBoard() )
+    keys = symmetricKeys( game.board )
+    key, symmetry = canonicalKey( game.board )
+
+    assert keys[ 0 ] == game.board.key
+    assert key == min( keys ) == keys[ symmetry ]
+
+
+# test_canonical_key
+
+
+def search( game: Game, canonical: bool ):
+    """ (best move, its value, nodes searched) of a depth 3 search """
+    engine = AlphaBetaSearch( maxDepth=3, timeLimit=None, canonical=canonical )
+    move = engine.search( game )
+
+    return (move.location, move.piece, engine.bestScore), engine.nodes
+
+# search
+
+
+def test_canonical_search():
+    for seed in range( 2 ):
+        assert search( randomPosition( 40, seed, BitBoard() ), True )[ 0 ] == \
+               search( randomPosition( 40, seed, BitBoard() ), False )[ 0 ]
+
+    # for
+
+
+# test_canonical_search
+
+
+def test_canonical_search_shares_symmetric_positions():
+    # the replies to symmetric opening moves transpose into each other
+    canonical, canonical_nodes = search( Game( BitBoard() ), True )
+    plain, plain_nodes = search( Game( BitBoard() ), False )
+
+    assert canonical == plain
+    assert canonical_nodes < plain_nodes // 4
+
+
+# test_canonical_search_shares_symmetric_positions